@@ -1,10 +1,9 @@
 from pathlib import Path
 
 import logging
+import cv2
+import img2pdf
 import numpy as np
-from reportlab.lib.units import mm
-from reportlab.pdfgen import canvas
-from PIL import Image
 
 
 # --- 定数
@@ -56,37 +55,40 @@ def main(
     offset_y: int = (canvas_h - board_h) // 2  # 上余白
 
     # --- キャンバス初期化 (白)
-    canvas_img: np.ndarray = np.ones((canvas_h, canvas_w), dtype=np.uint8) * 255
+    canvas_img: np.ndarray = np.full((canvas_h, canvas_w), 255, dtype=np.uint8)
 
     # --- 黒マス描画
-    rows = np.arange(board_h) // sq_px
-    cols = np.arange(board_w) // sq_px
-    checkerboard = (rows[:, None] + cols) % 2 == 0  # True で黒マス
-    board_img = np.where(checkerboard, 0, 255).astype(np.uint8)
-    canvas_img[offset_y : offset_y + board_h, offset_x : offset_x + board_w] = board_img
+    # 白で初期化済みなので黒マスの領域だけをスライス代入で塗りつぶす
+    for i in range(squares_y):
+        y0 = offset_y + i * sq_px
+        for j in range(i % 2, squares_x, 2):  # (i + j) が偶数のマスが黒
+            x0 = offset_x + j * sq_px
+            canvas_img[y0 : y0 + sq_px, x0 : x0 + sq_px] = 0
 
     # --- 保存先ディレクトリ作成
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     # --- PNG保存
-    Image.fromarray(canvas_img).save(out_path, format="PNG", compress_level=0, dpi=(dpi, dpi))
+    # 2 色のみの画像なので RLE 戦略 + 低圧縮レベルで高速に書き出す
+    # (DPI メタデータは付与しない。PDF 側で A4 等倍に貼り付けるため不要)
+    ok = cv2.imwrite(
+        str(out_path),
+        canvas_img,
+        [
+            cv2.IMWRITE_PNG_COMPRESSION, 1,
+            cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_RLE,
+        ],
+    )
+    if not ok:
+        raise OSError(f"PNG の書き出しに失敗しました: '{out_path}'")
     logger.info("保存完了: '%s' (%d×%dpx @%ddpi)", out_path, canvas_w, canvas_h, dpi)
 
     # --- PDF保存
-    # Pillowで一時保存したPNG画像をreportlabでA4に等倍貼り付け
-    c = canvas.Canvas(str(out_pdf), pagesize=(a4_w_mm * mm, a4_h_mm * mm))
-    # reportlabのA4原点は左下、Pillowは左上なので注意
-    # drawImage(x, y, width, height, ...)
-    c.drawImage(
-        str(out_path),
-        0, 0,  # x, y（左下基準で0,0）
-        a4_w_mm * mm,
-        a4_h_mm * mm,
-        preserveAspectRatio=False,
-        mask='auto'
-    )
-    c.showPage()
-    c.save()
+    # PNG の圧縮データを再エンコードせずそのまま A4 ページに等倍で埋め込む
+    pagesize = (img2pdf.mm_to_pt(a4_w_mm), img2pdf.mm_to_pt(a4_h_mm))
+    layout_fun = img2pdf.get_layout_fun(pagesize)
+    with open(out_pdf, "wb") as f:
+        f.write(img2pdf.convert(str(out_path), layout_fun=layout_fun))
     logger.info("保存完了: '%s' (%smm×%smm)", out_pdf, a4_w_mm, a4_h_mm)
 
     return canvas_w, canvas_h
@@ -1,7 +1,9 @@
 # estv/__main__.py
 
+import os
 import sys
 
+import cv2
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QFont
 import qdarkstyle
@@ -11,6 +13,12 @@ from estv.gui.main_window import MainWindow
 
 def main() -> None:
     """ESTiVision アプリケーションを起動するエントリーポイント。"""
+    # --- OpenCV 内部の並列処理 (parallel_for_) のスレッド数
+    # opencv-python の配布 wheel は pthreads バックエンドで並列化済みのため追加の
+    # ビルド要件は無い。既定の全コア使用だとキャプチャ・推論スレッドと GUI が
+    # 競合するので、GUI スレッド用に 1 コア残す
+    cv2.setNumThreads(max(1, (os.cpu_count() or 2) - 1))
+
     # --- QApplicationの初期化
     app: QApplication = QApplication(sys.argv)
 
@@ -0,0 +1,56 @@
+# estv/devices/_async.py
+"""重い処理を ``QThreadPool`` で実行し、結果を呼び出し元スレッドへ届ける補助関数。"""
+
+from collections.abc import Callable
+
+from PySide6.QtCore import (
+    QObject,
+    QRunnable,
+    QThreadPool,
+    Qt,
+    Signal,
+)
+
+
+class _TaskSignals(QObject):
+    """ワーカースレッドから呼び出し元スレッドへ結果を届けるためのシグナル。"""
+
+    done = Signal(object)  # 処理結果または Exception
+
+
+class _Task(QRunnable):
+    """``func`` を ``QThreadPool`` 上で実行し、結果をシグナルで返すタスク。"""
+
+    def __init__(self, func: Callable[[], object], signals: _TaskSignals) -> None:
+        super().__init__()
+        self._func = func
+        self._signals = signals
+
+
+    def run(self) -> None:
+        try:
+            result = self._func()
+        except Exception as exc:  # pylint: disable=broad-except
+            result = exc
+        self._signals.done.emit(result)
+
+
+# --- 完了通知前に破棄されないよう、実行中タスクのシグナルを保持する
+_PENDING_SIGNALS: set[_TaskSignals] = set()
+
+
+def run_in_thread_pool(func: Callable[[], object], on_done: Callable[[object], None]) -> None:
+    """``func`` をスレッドプールで実行し、結果を呼び出し元スレッドで ``on_done`` に渡す。
+
+    ``on_done`` は呼び出し元スレッドのイベントループ上で、``func`` の戻り値、
+    または ``func`` が送出した例外を引数に呼ばれる。
+    """
+    signals = _TaskSignals()
+
+    def _finish(result: object) -> None:
+        _PENDING_SIGNALS.discard(signals)
+        on_done(result)
+
+    signals.done.connect(_finish, Qt.ConnectionType.QueuedConnection)
+    _PENDING_SIGNALS.add(signals)
+    QThreadPool.globalInstance().start(_Task(func, signals))
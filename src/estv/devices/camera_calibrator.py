@@ -1,24 +1,64 @@
 # estv/devices/camera_calibrator.py
 """カメラキャリブレーションに関連するクラスを提供するモジュール。"""
 
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import os
 from pathlib import Path
 
 import cv2
-from filelock import FileLock
 import numpy as np
 
+from estv.devices._async import run_in_thread_pool
+
+
+# --- 定数
+BOARD_SIZE = (6, 9)     # 内部コーナー数 (横, 縦)
+SQUARE_SIZE = 20.0      # 1マスの一辺（mm）
+PYRAMID_MIN_LONG_SIDE = 640     # この長辺以上の画像は縮小画像で検出してから精緻化
+PARALLEL_MIN_VIEWS = 64         # 再投影誤差をスレッド並列で計算する最小画像枚数
+
+
+def _create_object_points(board_size: tuple[int, int], square_size: float) -> np.ndarray:
+    """チェスボードのコーナー座標をワールド座標系で生成する。"""
+    objp = np.zeros((board_size[1] * board_size[0], 3), np.float32)
+    objp[:, :2] = np.mgrid[0:board_size[0], 0:board_size[1]].T.reshape(-1, 2)
+    objp *= square_size
+    # 各画像・各インスタンスで同じ配列を共有するため書き込みを禁止しておく
+    objp.setflags(write=False)
+    return objp
+
+
+# --- 全インスタンスで共有する読み取り専用のコーナー座標
+_OBJP = _create_object_points(BOARD_SIZE, SQUARE_SIZE)
+
+
+def _view_sq_error(
+    objp: np.ndarray,
+    imgp: np.ndarray,
+    rvec: np.ndarray,
+    tvec: np.ndarray,
+    camera_matrix: np.ndarray,
+    dist_coeffs: np.ndarray,
+) -> tuple[float, int]:
+    """1 画像分の再投影二乗誤差和と点数を返す。"""
+    proj, _ = cv2.projectPoints(objp, rvec, tvec, camera_matrix, dist_coeffs)
+    # --- 二乗誤差和を NumPy の内積で直接求める（cv2.norm の呼び出しを省く）
+    diff = (imgp.reshape(-1, 2) - proj.reshape(-1, 2)).ravel()
+    return float(np.dot(diff, diff)), len(objp)
+
 
 class CameraCalibrator:
     """チェスボード画像からカメラ内部パラメータを推定するクラス。"""
 
     def __init__(self) -> None:
         """キャリブレーション用のパラメータと保存領域を初期化する。"""
-        self.board_size: tuple[int, int] = (6, 9)   # 内部コーナー数 (横, 縦)
-        self.square_size: float = 20.0              # 1マスの一辺（mm）
+        self.board_size: tuple[int, int] = BOARD_SIZE   # 内部コーナー数 (横, 縦)
+        self.square_size: float = SQUARE_SIZE           # 1マスの一辺（mm）
 
         self.object_points: list[np.ndarray] = []   # ワールド座標 (N, 3)
         self.image_points: list[np.ndarray] = []    # 画像座標 (N, 1, 2)
-        self._objp: np.ndarray = self._create_object_points()
+        self._objp: np.ndarray = _OBJP
 
         self._camera_matrix: np.ndarray | None = None
         self._dist_coeffs: np.ndarray | None = None
@@ -26,24 +66,28 @@ class CameraCalibrator:
         self._tvecs: list[np.ndarray] | None = None
         self._reproj_error: float | None = None
 
-
-    def _create_object_points(self) -> np.ndarray:
-        """チェスボードのコーナー座標をワールド座標系で生成する。"""
-        objp = np.zeros((self.board_size[1] * self.board_size[0], 3), np.float32)
-        objp[:, :2] = np.mgrid[0:self.board_size[0], 0:self.board_size[1]].T.reshape(-1, 2)
-        objp *= self.square_size
-        return objp
+        # --- 画像サイズごとの歪み補正マップ (map1, map2, new_camera_matrix)
+        self._undistort_maps: dict[tuple[int, int], tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
 
 
     def add_chessboard_image(self, image: np.ndarray) -> bool:
         """画像からコーナーを検出しキャリブレーション用に保存する。"""
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
-        found, corners = cv2.findChessboardCorners(gray, self.board_size, None)
-        if found:
+        # 大きな画像は 1 段縮小したピラミッド画像で検出し、元解像度で精緻化する
+        use_pyramid = max(gray.shape[:2]) >= PYRAMID_MIN_LONG_SIDE
+        detect_img = cv2.pyrDown(gray) if use_pyramid else gray
+        # SB 版には FAST_CHECK が無いため、ボードが映っていないフレームは先に棄却する
+        if not cv2.checkChessboard(detect_img, self.board_size):
+            return False
+        # SB 版は検出とサブピクセル精度の推定を一度に行うため cornerSubPix は不要
+        flags = cv2.CALIB_CB_NORMALIZE_IMAGE | cv2.CALIB_CB_ACCURACY
+        found, corners = cv2.findChessboardCornersSB(detect_img, self.board_size, flags=flags)
+        if found and use_pyramid:
             criteria = (cv2.TermCriteria_EPS + cv2.TermCriteria_MAX_ITER, 30, 0.001)
-            corners2 = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
-            self.object_points.append(self._objp.copy())
-            self.image_points.append(corners2)
+            corners = cv2.cornerSubPix(gray, corners * 2.0, (11, 11), (-1, -1), criteria)
+        if found:
+            self.object_points.append(self._objp)
+            self.image_points.append(corners)
         return found
 
 
@@ -59,6 +103,7 @@ class CameraCalibrator:
         self._rvecs = rvecs
         self._tvecs = tvecs
         self._reproj_error = self._calc_reprojection_error()
+        self._undistort_maps.clear()
         return ret
 
 
@@ -71,13 +116,18 @@ class CameraCalibrator:
             or self._dist_coeffs is None
         ):
             return None
-        total_error = 0.0
-        total_points = 0
-        for objp, imgp, rvec, tvec in zip(self.object_points, self.image_points, self._rvecs, self._tvecs):
-            proj, _ = cv2.projectPoints(objp, rvec, tvec, self._camera_matrix, self._dist_coeffs)
-            error = cv2.norm(imgp, proj, cv2.NORM_L2)
-            total_error += error ** 2
-            total_points += len(objp)
+        views = list(zip(self.object_points, self.image_points, self._rvecs, self._tvecs))
+        k, d = self._camera_matrix, self._dist_coeffs
+        workers = os.cpu_count() or 1
+        # --- projectPoints は GIL を解放するため、枚数が多ければスレッドで並列化する
+        #     (少数枚ではスレッド生成のコストが計算量を上回るため逐次処理)
+        if len(views) >= PARALLEL_MIN_VIEWS and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                results = list(ex.map(lambda v: _view_sq_error(*v, k, d), views))
+        else:
+            results = [_view_sq_error(*v, k, d) for v in views]
+        total_error = sum(err for err, _ in results)
+        total_points = sum(n for _, n in results)
         return float(np.sqrt(total_error / total_points)) if total_points > 0 else None
 
 
@@ -99,23 +149,93 @@ class CameraCalibrator:
         return self._reproj_error
 
 
+    def get_undistort_maps(
+        self, image_size: tuple[int, int]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """歪み補正用の ``cv2.remap`` マップを返す（画像サイズごとにキャッシュ）。
+
+        パラメータ
+        ----------
+        image_size : tuple[int, int]
+            画像サイズ (幅, 高さ)。
+
+        戻り値
+        ------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            ``(map1, map2, new_camera_matrix)``。マップは ``CV_16SC2`` 形式で、
+            ``cv2.remap(frame, map1, map2, cv2.INTER_LINEAR)`` にそのまま渡せる。
+        """
+        if self._camera_matrix is None or self._dist_coeffs is None:
+            raise ValueError("キャリブレーション未実施です。")
+        maps = self._undistort_maps.get(image_size)
+        if maps is None:
+            new_k, _ = cv2.getOptimalNewCameraMatrix(
+                self._camera_matrix, self._dist_coeffs, image_size, 0
+            )
+            map1, map2 = cv2.initUndistortRectifyMap(
+                self._camera_matrix, self._dist_coeffs, None, new_k, image_size, cv2.CV_16SC2
+            )
+            maps = (map1, map2, new_k)
+            self._undistort_maps[image_size] = maps
+        return maps
+
+
     def save(self, filename: str | Path) -> None:
         if self._camera_matrix is None:
             raise ValueError("キャリブレーション未実施です。")
-        lock_path = str(filename) + ".lock"
-        with FileLock(lock_path):
-            np.savez(
-                str(filename),
-                camera_matrix=self._camera_matrix,
-                dist_coeffs=self._dist_coeffs,
-                reproj_error=self._reproj_error,
-            )
+        # --- 誤差は float64 スカラーで保存し、object 配列（pickle）を作らない
+        arrays = {
+            "camera_matrix": self._camera_matrix,
+            "dist_coeffs": self._dist_coeffs,
+        }
+        if self._reproj_error is not None:
+            arrays["reproj_error"] = np.float64(self._reproj_error)
+        # --- 一時ファイルに書き出してから置き換え、読み手に途中状態を見せない
+        tmp_path = str(filename) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, filename)
 
 
     def load(self, filename: str | Path) -> None:
-        lock_path = str(filename) + ".lock"
-        with FileLock(lock_path):
-            data = np.load(str(filename))
+        with np.load(str(filename)) as data:
             self._camera_matrix = data["camera_matrix"]
             self._dist_coeffs = data["dist_coeffs"]
             self._reproj_error = float(data["reproj_error"]) if "reproj_error" in data else None
+        self._undistort_maps.clear()
+
+
+def add_chessboard_image_async(
+    calibrator: CameraCalibrator,
+    image: np.ndarray,
+    on_done: Callable[[bool | Exception], None],
+) -> None:
+    """``calibrator.add_chessboard_image(image)`` をスレッドプールで実行する。
+
+    検出は高解像度で数十〜数百ミリ秒かかるため、GUI スレッドから外して行う。
+    完了までは ``calibrator`` と ``image`` を操作しないこと。
+    ``on_done`` は呼び出し元スレッドのイベントループ上で、
+    検出できたかどうか、または発生した例外を引数に呼ばれる。
+    """
+    run_in_thread_pool(lambda: calibrator.add_chessboard_image(image), on_done)
+
+
+def calibrate_and_save_async(
+    calibrator: CameraCalibrator,
+    image_shape: tuple[int, int],
+    save_path: str | Path,
+    on_done: Callable[[float | Exception], None],
+) -> None:
+    """``calibrator`` のキャリブレーションと保存をスレッドプールで実行する。
+
+    ``calibrateCamera`` は GIL を解放するため、GUI スレッドから呼んでも
+    イベントループを止めない。完了までは ``calibrator`` を操作しないこと。
+    ``on_done`` は呼び出し元スレッドのイベントループ上で、
+    成功時は RMS 再投影誤差、失敗時は発生した例外を引数に呼ばれる。
+    """
+    def _calibrate_and_save() -> float:
+        rms = calibrator.calibrate(image_shape)
+        calibrator.save(save_path)
+        return rms
+
+    run_in_thread_pool(_calibrate_and_save, on_done)
@@ -1,5 +1,7 @@
 # estv/devices/camera_stream.py
 
+import logging
+import sys
 import time
 
 import cv2
@@ -9,12 +11,32 @@ from PySide6.QtCore import (
     Signal,
     Slot,
 )
-from PySide6.QtGui import QImage
+
+
+logger = logging.getLogger(__name__)
 
 
 # --- 定数
 MAX_LONG_SIDE_LENGTH = 320  # 長辺の最大サイズ
 CAPTURE_FPS = 30 # 最大フレームレート
+CAPTURE_FOURCC = "MJPG" # カメラに要求するピクセルフォーマット
+
+# --- プラットフォームごとのキャプチャバックエンド
+if sys.platform.startswith("win"):
+    CAPTURE_BACKEND = cv2.CAP_DSHOW
+elif sys.platform.startswith("linux"):
+    CAPTURE_BACKEND = cv2.CAP_V4L2
+else:
+    CAPTURE_BACKEND = cv2.CAP_ANY
+
+
+def _fit_size(w: int, h: int, max_length: int) -> tuple[int, int] | None:
+    """長辺を ``max_length`` に収めたサイズ (幅, 高さ) を返す。縮小不要なら ``None``。"""
+    long_side = max(w, h)
+    if long_side <= max_length:
+        return None
+    scale = max_length / long_side
+    return int(w * scale), int(h * scale)
 
 
 def resize_if_needed(frame: np.ndarray, max_length: int) -> np.ndarray:
@@ -33,10 +55,9 @@ def resize_if_needed(frame: np.ndarray, max_length: int) -> np.ndarray:
         リサイズ後のフレーム。
     """
     h, w = frame.shape[:2]
-    if max(w, h) > max_length:
-        scale = max_length / max(w, h)
-        new_w, new_h = int(w * scale), int(h * scale)
-        return cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    size = _fit_size(w, h, max_length)
+    if size is not None:
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
     return frame
 
 
@@ -46,7 +67,6 @@ class CameraStream(QThread):
     # --- シグナル
     error = Signal(str) # エラーメッセージを通知
     frame_ready = Signal(object) # フレーム取得時に通知
-    q_image_ready = Signal(QImage) # GUI用のQImage取得時に通知
 
 
     def __init__(self, device_id: int) -> None:
@@ -59,11 +79,15 @@ class CameraStream(QThread):
         self._pending_exposure: float | None = None
         # --- ソフトウェア明るさ補正値 (0-100)
         self._brightness: float = 0.0
+        # --- 明るさ補正用のルックアップテーブル（補正なしの場合は None）
+        self._brightness_lut: np.ndarray | None = None
+        # --- 送出するフレームの間引き間隔（N フレームに 1 回だけデコード・送出）
+        self._frame_stride: int = 1
 
 
     def run(self) -> None:
         """スレッド開始時に実行されるメインのキャプチャループ。"""
-        cap = cv2.VideoCapture(self._device_id, cv2.CAP_ANY)
+        cap = cv2.VideoCapture(self._device_id, CAPTURE_BACKEND)
         self._cap = cap
 
         try:
@@ -71,6 +95,17 @@ class CameraStream(QThread):
                 self.error.emit("カメラを開けませんでした。")
                 return
 
+            # --- MJPG を要求し、ソフトウェアでの YUV→BGR 変換と USB 帯域を削減
+            # 解像度・FPS より先に設定しないと反映されないドライバがある
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*CAPTURE_FOURCC))
+            fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+            actual = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+            if actual != CAPTURE_FOURCC:
+                logger.info(
+                    "[Camera %d] %s is not accepted by the driver (using %r)",
+                    self._device_id, CAPTURE_FOURCC, actual,
+                )
+
             # --- カメラに希望解像度をリクエスト
             origin_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             origin_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -81,45 +116,93 @@ class CameraStream(QThread):
             cap.set(cv2.CAP_PROP_FRAME_WIDTH, target_w)
             cap.set(cv2.CAP_PROP_FRAME_HEIGHT, target_h)
             cap.set(cv2.CAP_PROP_FPS, CAPTURE_FPS)
+            # --- ドライバ側のキューを最小にして古いフレームの滞留を防ぐ
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+            # --- 露出はキャプチャスレッド上でのみ設定し、ドライバ呼び出しを直列化する
+            applied_exposure: float | None = None
+
+            # --- OpenCL (T-API) が有効なら補正処理を UMat 上で実行する
+            use_opencl = cv2.ocl.useOpenCL()
 
-            if self._pending_exposure is not None:
-                cap.set(cv2.CAP_PROP_EXPOSURE, self._pending_exposure)
+            # --- 縮小後サイズは入力解像度が変わったときだけ計算し直す
+            src_shape: tuple[int, ...] | None = None
+            resize_to: tuple[int, int] | None = None
+
+            # --- デコード先バッファ（毎フレーム使い回し、送出はしない）
+            capture_buf: np.ndarray | None = None
 
             # --- 映像取得ループ
             interval = 1.0 / CAPTURE_FPS  # 1フレームの理想間隔（秒）
             next_frame_time = time.perf_counter()
+            frame_index = 0
             while not self.isInterruptionRequested():
+                # --- GUI から要求された露出値が変わっていれば反映
+                exposure = self._pending_exposure
+                if exposure is not None and exposure != applied_exposure:
+                    cap.set(cv2.CAP_PROP_EXPOSURE, exposure)
+                    applied_exposure = exposure
+
+                # --- 送出時刻までは grab() のみ行い古いフレームを読み捨てる
+                if not cap.grab():
+                    break
                 now = time.perf_counter()
                 if now < next_frame_time:
-                    time.sleep(next_frame_time - now)
+                    continue
+                # --- 1フレーム以上遅れた場合は基準時刻を現在に合わせ直し、
+                #     遅れを取り戻すための連続送出を避ける
+                if now - next_frame_time > interval:
+                    next_frame_time = now
                 next_frame_time += interval
 
-                # --- 実フレーム取得
-                ret, frame = cap.read()
+                # --- 間引き対象のフレームはデコードせずに読み捨てる
+                frame_index += 1
+                if frame_index % self._frame_stride:
+                    continue
+
+                # --- 実フレーム取得（デコードは送出するフレームのみ）
+                # サイズが一致すれば OpenCV は capture_buf へ直接書き込む
+                ret, frame = cap.retrieve(capture_buf)
                 if not ret:
                     break
+                capture_buf = frame
 
-                # --- 必要ならリサイズ
-                frame = resize_if_needed(frame, MAX_LONG_SIDE_LENGTH)
+                # --- 必要ならリサイズ（転送量を減らすためホスト側で先に縮小）
+                if frame.shape != src_shape:
+                    src_shape = frame.shape
+                    resize_to = _fit_size(frame.shape[1], frame.shape[0], MAX_LONG_SIDE_LENGTH)
+                did_resize = resize_to is not None
+                if did_resize:
+                    frame = cv2.resize(frame, resize_to, interpolation=cv2.INTER_AREA)
+                img = cv2.UMat(frame) if use_opencl else frame
 
                 # --- 明るさ補正
-                if self._brightness != 0:
-                    factor = 1.0 + self._brightness / 100.0
-                    frame = cv2.convertScaleAbs(frame, alpha=factor, beta=0)
+                lut = self._brightness_lut
+                if lut is not None:
+                    img = cv2.LUT(img, lut)
 
                 # --- ルミナンスノイズ除去
-                frame = cv2.GaussianBlur(frame, (3, 3), 0)
+                # INTER_AREA での縮小は平均化で既に平滑化されているため、
+                # 明るさ補正でノイズが強調されない場合はぼかしを省略する
+                if not did_resize or lut is not None:
+                    img = cv2.GaussianBlur(img, (3, 3), 0)
+
+                # --- UMat の場合は最後にまとめてホストへ戻す
+                frame = img.get() if use_opencl else img
 
-                # --- OpenCVのBGRからQtのRGBに変換
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, _ = rgb.shape
-                qimg = QImage(
-                    rgb.data, w, h, 3 * w, QImage.Format.Format_RGB888
-                ).copy()
+                # --- 受信側はフレームを保持し続けるため、使い回すバッファは送出しない
+                # 縮小（resize）しない場合は必ず GaussianBlur を通り、LUT・UMat の
+                # 転送も含めてどの経路でも新しい配列になるため、コピーは不要。
+                # 下の読み取り専用化がデコード先バッファに及ばないことをここで保証する
+                assert frame is not capture_buf
+
+                # --- 受信側は複数（表示・推定・キャリブ）でコピーせずに共有するため、
+                #     送出したフレームは読み取り専用にして誤った書き換えを防ぐ
+                frame.setflags(write=False)
 
                 # --- シグナルを発行
+                # 表示側は配列から直接描画するため、ここでは QImage を作らない
                 self.frame_ready.emit(frame)
-                self.q_image_ready.emit(qimg)
         finally:
             cap.release()
             self._cap = None
@@ -133,13 +216,30 @@ class CameraStream(QThread):
 
     @Slot(float)
     def set_exposure(self, value: float) -> None:
-        """露出値を設定する。"""
+        """露出値を設定する。
+
+        値を記録するだけで、実際の設定はキャプチャループが自スレッドで行う。
+        スライダー操作などで連続して呼ばれても、ドライバへの設定は
+        フレームごとに最新値の 1 回だけになる（途中の値は間引かれる）。
+        """
         self._pending_exposure = value
-        if self._cap is not None:
-            self._cap.set(cv2.CAP_PROP_EXPOSURE, value)
+
+
+    @Slot(int)
+    def set_frame_stride(self, stride: int) -> None:
+        """``stride`` フレームにつき 1 フレームだけデコード・送出するよう設定する。"""
+        self._frame_stride = max(1, int(stride))
 
 
     @Slot(float)
     def set_brightness(self, value: float) -> None:
         """ソフトウェアで適用する明るさ補正値を設定する。"""
         self._brightness = value
+        if value == 0:
+            self._brightness_lut = None
+            return
+        # --- 画素値ごとの倍率適用結果を事前計算（convertScaleAbs と同じ丸め・飽和）
+        factor = 1.0 + value / 100.0
+        self._brightness_lut = np.clip(
+            np.rint(np.arange(256) * factor), 0, 255
+        ).astype(np.uint8)
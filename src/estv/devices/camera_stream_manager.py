@@ -1,14 +1,17 @@
 # estv/devices/camera_stream_manager.py
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 import logging
 import threading
 import warnings
 
 from PySide6.QtCore import (
     QObject,
+    Qt,
     QTimer,
     Signal,
+    Slot,
 )
 
 from estv.devices.camera_stream import CameraStream
@@ -17,12 +20,38 @@ from estv.devices.camera_stream import CameraStream
 logger = logging.getLogger(__name__)
 
 
+class _StreamAdapter(QObject):
+    """1 つの :class:`CameraStream` のシグナルをカメラID付きでマネージャーへ中継する。"""
+
+    def __init__(
+        self, manager: "CameraStreamManager", camera_id: str, stream: CameraStream
+    ) -> None:
+        super().__init__()
+        self._manager = manager
+        self._camera_id = camera_id
+        self._stream = stream
+
+
+    @Slot(object)
+    def on_frame(self, frame: object) -> None:
+        self._manager.frame_ready.emit(self._camera_id, frame)
+
+
+    @Slot(str)
+    def on_error(self, msg: str) -> None:
+        self._manager.handle_error(self._camera_id, msg)
+
+
+    @Slot()
+    def on_finished(self) -> None:
+        self._manager.cleanup_stream(self._camera_id, self._stream)
+
+
 class CameraStreamManager(QObject):
     """複数の :class:`CameraStream` インスタンスを管理するクラス。"""
 
     streams_updated = Signal()
     frame_ready = Signal(str, object)
-    q_image_ready = Signal(str, object)
 
 
     def __init__(
@@ -46,7 +75,11 @@ class CameraStreamManager(QObject):
         super().__init__()
 
         # --- ストリームを保持する辞書
+        # 更新時は新しい辞書を作って差し替える（コピーオンライト）。
+        # 読み手はロックを取らずに属性を一度だけ読めば一貫した状態を参照できる。
         self._streams: dict[str, CameraStream] = {}
+        # --- ストリームごとのシグナル中継オブジェクト（_streams と同時に更新）
+        self._adapters: dict[str, _StreamAdapter] = {}
 
         # --- カメラIDからインデックスを取得する関数
         self._device_index_lookup = device_index_lookup
@@ -61,9 +94,40 @@ class CameraStreamManager(QObject):
         # --- 再起動待ちデバイス
         self._pending_restart: set[str] = set()
 
-        # --- 排他制御用ロック
+        # --- 書き手同士の排他制御用ロック（読み取りはロック不要）
         self._lock = threading.Lock()
 
+        # --- streams_updated をイベントループ 1 周につき 1 回にまとめるタイマー
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(0)
+        self._update_timer.timeout.connect(self.streams_updated)
+
+        # --- 一括操作中は通知を保留する
+        self._batch_depth: int = 0
+        self._update_pending: bool = False
+
+
+    @contextmanager
+    def _batch_updates(self) -> Iterator[None]:
+        """ブロック内の ``streams_updated`` 通知を抑制し、終了時に 1 回だけ通知する。"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._update_pending:
+                self._update_pending = False
+                self._update_timer.start()
+
+
+    def _notify_streams_updated(self) -> None:
+        """``streams_updated`` の発行を予約する（連続した要求は 1 回にまとめる）。"""
+        if self._batch_depth > 0:
+            self._update_pending = True
+            return
+        self._update_timer.start()
+
 
     def start_camera(self, camera_id: str) -> None:
         """指定したIDのカメラのストリームを開始する。"""
@@ -71,25 +135,30 @@ class CameraStreamManager(QObject):
         if device_index is None:
             warnings.warn(f"Camera {camera_id} not found")
             return
+        # --- シグナルの受信側が同じロックを取得できるよう、発行はロック外で行う
+        message: str | None = None
         with self._lock:
             if camera_id in self._streams:
-                warnings.warn(f"Camera {camera_id} stream already running")
-                self.streams_updated.emit()
-                return
-            if len(self._streams) >= self._max_streams:
-                warnings.warn(
-                    f"Cannot start more than {self._max_streams} cameras simultaneously"
-                )
-                self.streams_updated.emit()
-                return
-            stream = CameraStream(device_index)
-            stream.frame_ready.connect(lambda frame, c=camera_id: self.frame_ready.emit(c, frame))
-            stream.q_image_ready.connect(lambda qimg, c=camera_id: self.q_image_ready.emit(c, qimg))
-            stream.error.connect(lambda msg, c=camera_id: self.handle_error(c, msg))
-            stream.finished.connect(lambda c=camera_id: self.cleanup_stream(c))
-            self._streams[camera_id] = stream
-            stream.start()
-        self.streams_updated.emit()
+                message = f"Camera {camera_id} stream already running"
+            elif len(self._streams) >= self._max_streams:
+                message = f"Cannot start more than {self._max_streams} cameras simultaneously"
+            else:
+                stream = CameraStream(device_index)
+                adapter = _StreamAdapter(self, camera_id, stream)
+                # --- 発行元は常にキャプチャスレッド、受信側は GUI スレッドなので
+                #     接続種別を明示し、発行ごとのスレッド判定を省く
+                queued = Qt.ConnectionType.QueuedConnection
+                stream.frame_ready.connect(adapter.on_frame, queued)
+                stream.error.connect(adapter.on_error, queued)
+                stream.finished.connect(adapter.on_finished, queued)
+                self._adapters[camera_id] = adapter
+                streams = dict(self._streams)
+                streams[camera_id] = stream
+                self._streams = streams
+                stream.start()
+        if message is not None:
+            warnings.warn(message)
+        self._notify_streams_updated()
 
     @property
     def max_streams(self) -> int:
@@ -99,8 +168,7 @@ class CameraStreamManager(QObject):
 
     def stop_camera(self, camera_id: str) -> None:
         """指定したカメラのストリームを停止して後始末を行う。"""
-        with self._lock:
-            stream = self._streams.get(camera_id)
+        stream = self._streams.get(camera_id)
 
         if stream is None:
             warnings.warn(f"Camera {camera_id} stream not running")
@@ -111,27 +179,40 @@ class CameraStreamManager(QObject):
         self.cleanup_stream(camera_id)
 
 
+    def _running_stream(self, camera_id: str) -> CameraStream | None:
+        """実行中のストリームを返す（起動していなければ ``None``）。"""
+        return self._streams.get(camera_id)
+
+
     def set_exposure(self, camera_id: str, value: float) -> None:
         """指定カメラの露出を設定する。"""
-        with self._lock:
-            stream = self._streams.get(camera_id)
-        if stream is not None:
+        if (stream := self._running_stream(camera_id)) is not None:
             stream.set_exposure(value)
 
 
     def set_brightness(self, camera_id: str, value: float) -> None:
         """指定カメラのソフトウェア明るさ補正を設定する。"""
-        with self._lock:
-            stream = self._streams.get(camera_id)
-        if stream is not None:
+        if (stream := self._running_stream(camera_id)) is not None:
             stream.set_brightness(value)
 
 
+    def set_frame_stride(self, camera_id: str, stride: int) -> None:
+        """指定カメラで ``stride`` フレームに 1 回だけフレームを送出させる。"""
+        if (stream := self._running_stream(camera_id)) is not None:
+            stream.set_frame_stride(stride)
+
+
     def stop_all(self) -> None:
         """実行中のすべてのカメラストリームを停止する。"""
-        for camera_id in self.running_device_ids():
-            self.stop_camera(camera_id)
-        self.streams_updated.emit()
+        # --- 先に全ストリームへ停止要求を出してから待機し、終了処理を並行させる
+        streams = list(self._streams.items())
+        for _, stream in streams:
+            stream.stop()
+        with self._batch_updates():
+            for camera_id, stream in streams:
+                stream.wait()
+                self.cleanup_stream(camera_id)
+            self._notify_streams_updated()
 
 
     def shutdown(self) -> None:
@@ -142,22 +223,32 @@ class CameraStreamManager(QObject):
     def handle_error(self, camera_id: str, msg: str) -> None:
         """``camera_id`` のストリームでエラーが発生した際の処理を行う。"""
         logger.error("[Camera %s] Error: %s", camera_id, msg)
-        with self._lock:
-            if camera_id in self._streams:
-                stream = self._streams[camera_id]
-                stream.stop()
+        stream = self._streams.get(camera_id)
+        if stream is not None:
+            stream.stop()
 
         if self._auto_restart:
             self._pending_restart.add(camera_id)
 
 
-    def cleanup_stream(self, camera_id: str) -> None:
-        """終了したストリームを削除し、必要なら再起動する。"""
+    def cleanup_stream(self, camera_id: str, stream: CameraStream | None = None) -> None:
+        """終了したストリームを削除し、必要なら再起動する。
+
+        ``stream`` を指定した場合は、登録中のストリームがそれと同一のときだけ削除する。
+        停止済みストリームの ``finished`` が遅れて届いても、同じIDで
+        起動し直した新しいストリームを誤って削除しない。
+        """
         with self._lock:
-            if camera_id in self._streams:
-                stream = self._streams[camera_id]
-                stream.deleteLater()
-                del self._streams[camera_id]
+            current = self._streams.get(camera_id)
+            if current is None or (stream is not None and current is not stream):
+                return
+            streams = dict(self._streams)
+            del streams[camera_id]
+            self._streams = streams
+            adapter = self._adapters.pop(camera_id, None)
+        current.deleteLater()
+        if adapter is not None:
+            adapter.deleteLater()
 
         if self._auto_restart and camera_id in self._pending_restart:
             self._pending_restart.remove(camera_id)
@@ -165,10 +256,9 @@ class CameraStreamManager(QObject):
                 self._restart_delay_ms,
                 lambda c=camera_id: self.start_camera(c),
             )
-        self.streams_updated.emit()
+        self._notify_streams_updated()
 
 
     def running_device_ids(self) -> list[str]:
         """現在実行中のカメラIDの一覧を返す。"""
-        with self._lock:
-            return list(self._streams.keys())
+        return list(self._streams)
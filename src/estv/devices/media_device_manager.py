@@ -1,6 +1,9 @@
 # estv/devices/media_device_manager.py
 """利用可能なメディアデバイスの監視を行うモジュール。"""
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from PySide6.QtCore import (
     QObject,
     QTimer,
@@ -30,7 +33,11 @@ class MediaDeviceManager(QObject):
         self._media_devices.videoInputsChanged.connect(self._on_camera_devices_changed)
 
         # --- カメラデバイスのリストをキャッシュ
-        self._camera_devices: list[QCameraDevice] = self._media_devices.videoInputs()
+        self._camera_devices: list[QCameraDevice] = []
+        self._id_to_index: dict[str, int] = {}
+        self._id_to_name: dict[str, str] = {}
+        self._camera_device_infos: list[dict[str, str]] = []
+        self._set_camera_devices(self._media_devices.videoInputs())
 
         # --- デバイス更新を遅延実行するタイマー
         self._update_timer = QTimer(self)
@@ -51,38 +58,42 @@ class MediaDeviceManager(QObject):
         self._update_timer.start(0)
 
 
+    def _set_camera_devices(self, devices: list[QCameraDevice]) -> None:
+        """カメラデバイス一覧を保持し、ID 文字列の対応表を作り直す。"""
+        self._camera_devices = devices
+        # --- QByteArray の ID はデバイス一覧が変わるまで不変なので一度だけデコードする
+        id_to_index: dict[str, int] = {}
+        id_to_name: dict[str, str] = {}
+        # --- 通知用の一覧もここで作っておき、通知のたびに作り直さない
+        infos: list[dict[str, str]] = []
+        for idx, dev in enumerate(devices):
+            camera_id = bytes(dev.id()).decode("utf-8", errors="ignore")
+            name = dev.description()
+            id_to_index.setdefault(camera_id, idx)
+            id_to_name[camera_id] = name
+            infos.append({"id": camera_id, "name": name})
+        self._id_to_index = id_to_index
+        self._id_to_name = id_to_name
+        self._camera_device_infos = infos
+
+
     def _update_camera_devices(self) -> None:
         """カメラデバイス一覧を更新して通知する。"""
-        self._camera_devices = self._media_devices.videoInputs()
+        self._set_camera_devices(self._media_devices.videoInputs())
         self._notify_camera_devices_update()
 
 
     def _notify_camera_devices_update(self) -> None:
         """現在のカメラデバイス一覧をシグナルで通知する。"""
-        # --- カメラデバイスのIDと名前をまとめたリストを作成
-        camera_device_infos: list[dict[str, str]] = [
-            {
-                "id": bytes(dev.id()).decode("utf-8", errors="ignore"),
-                "name": dev.description(),
-            }
-            for dev in self._camera_devices
-        ]
-
         # --- シグナルを発行
-        self.camera_devices_update_signal.emit(camera_device_infos)
+        self.camera_devices_update_signal.emit(self._camera_device_infos)
 
 
     @property
-    def camera_id_name_map(self) -> dict[str, str]:
-        """カメラデバイスIDから名称へのマッピング。"""
-        return {
-            bytes(dev.id()).decode("utf-8", errors="ignore"): dev.description()
-            for dev in self._camera_devices
-        }
+    def camera_id_name_map(self) -> Mapping[str, str]:
+        """カメラデバイスIDから名称へのマッピング（読み取り専用）。"""
+        return MappingProxyType(self._id_to_name)
 
     def camera_index_by_id(self, camera_id: str) -> int | None:
         """指定IDのカメラの現在のインデックスを返す。"""
-        for idx, dev in enumerate(self._camera_devices):
-            if bytes(dev.id()).decode("utf-8", errors="ignore") == camera_id:
-                return idx
-        return None
+        return self._id_to_index.get(camera_id)
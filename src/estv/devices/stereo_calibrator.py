@@ -1,12 +1,27 @@
 # src/estv/devices/stereo_calibrator.py
 
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from pathlib import Path
+import threading
 
 import cv2
 import numpy as np
 
+from estv.devices._async import run_in_thread_pool
+
+
+# --- 2 台分のコーナー検出を並行実行するスレッドプール（OpenCV は GIL を解放する）
+_CORNER_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stereo-corners")
+# --- グレースケール変換の出力先バッファ（並行検出で衝突しないようスレッドごとに保持）
+_GRAY_BUFFERS = threading.local()
+
+
+# --- 整流パラメータの保存キー（stereoRectify の戻り値の順）
+_RECTIFICATION_KEYS = ("r1", "r2", "p1", "p2", "q")
+
 
 @dataclass
 class StereoParams:
@@ -15,7 +30,8 @@ class StereoParams:
     Notes
     -----
     - r, t は「カメラ1座標系 → カメラ2座標系」への変換。
-    - p1/p2 は整流後の投影行列。三角測量では使わず保存のみ。
+    - r1/r2/p1/p2/q は整流パラメータ。三角測量では使わないため、
+      初回アクセス時に ``cv2.stereoRectify`` で計算する。
     - 単位は square_size_m に依存（通常はメートル）。
     """
 
@@ -25,79 +41,184 @@ class StereoParams:
     d2: np.ndarray
     r: np.ndarray          # (3,3)
     t: np.ndarray          # (3,)
-    r1: np.ndarray         # rectification for cam1
-    r2: np.ndarray         # rectification for cam2
-    p1: np.ndarray         # projection for cam1 (rectified)
-    p2: np.ndarray         # projection for cam2 (rectified)
-    q: np.ndarray          # disparity-to-depth matrix
     rms: float
     board_size: tuple[int, int]
     square_size_m: float
     cam1_id: str
     cam2_id: str
     image_size: tuple[int, int]
+    # --- 計算済みの整流パラメータ (r1, r2, p1, p2, q)。未計算なら None
+    rectification: tuple[np.ndarray, ...] | None = field(
+        default=None, repr=False, compare=False
+    )
+
+    def _rectify(self) -> tuple[np.ndarray, ...]:
+        """整流パラメータを返す（未計算ならここで計算して保持する）。"""
+        if self.rectification is None:
+            r1, r2, p1, p2, q, _, _ = cv2.stereoRectify(
+                cameraMatrix1=self.k1,
+                distCoeffs1=self.d1,
+                cameraMatrix2=self.k2,
+                distCoeffs2=self.d2,
+                imageSize=self.image_size,
+                R=self.r,
+                T=self.t,
+                alpha=0,  # 0:切り詰め最大, 1:すべて保持
+            )
+            self.rectification = (r1, r2, p1, p2, q)
+        return self.rectification
+
+    @property
+    def r1(self) -> np.ndarray:
+        """カメラ1の整流回転行列。"""
+        return self._rectify()[0]
+
+    @property
+    def r2(self) -> np.ndarray:
+        """カメラ2の整流回転行列。"""
+        return self._rectify()[1]
+
+    @property
+    def p1(self) -> np.ndarray:
+        """カメラ1の整流後の投影行列。"""
+        return self._rectify()[2]
+
+    @property
+    def p2(self) -> np.ndarray:
+        """カメラ2の整流後の投影行列。"""
+        return self._rectify()[3]
+
+    @property
+    def q(self) -> np.ndarray:
+        """視差から深度への変換行列。"""
+        return self._rectify()[4]
 
     def save(self, path: Path) -> None:
-        """NPZ形式で保存する。"""
+        """NPZ形式で保存する（数 KB のため圧縮はしない）。
+
+        整流パラメータは計算済みの場合のみ保存する。
+        """
         path.parent.mkdir(parents=True, exist_ok=True)
-        np.savez_compressed(
-            str(path),
-            k1=self.k1,
-            d1=self.d1,
-            k2=self.k2,
-            d2=self.d2,
-            r=self.r,
-            t=self.t,
-            r1=self.r1,
-            r2=self.r2,
-            p1=self.p1,
-            p2=self.p2,
-            q=self.q,
-            rms=np.float64(self.rms),
-            board_size=np.asarray(self.board_size, dtype=np.int32),
-            square_size_m=np.float64(self.square_size_m),
-            cam1_id=self.cam1_id,
-            cam2_id=self.cam2_id,
-            image_size=np.asarray(self.image_size, dtype=np.int32),
-        )
+        arrays = {
+            "k1": self.k1,
+            "d1": self.d1,
+            "k2": self.k2,
+            "d2": self.d2,
+            "r": self.r,
+            "t": self.t,
+            "rms": np.float64(self.rms),
+            "board_size": np.asarray(self.board_size, dtype=np.int32),
+            "square_size_m": np.float64(self.square_size_m),
+            "cam1_id": self.cam1_id,
+            "cam2_id": self.cam2_id,
+            "image_size": np.asarray(self.image_size, dtype=np.int32),
+        }
+        if self.rectification is not None:
+            arrays.update(zip(_RECTIFICATION_KEYS, self.rectification))
+        np.savez(str(path), **arrays)
 
     @staticmethod
     def load(path: Path) -> "StereoParams":
-        """NPZから読込む。"""
-        data = np.load(str(path), allow_pickle=True)
-        return StereoParams(
-            k1=np.asarray(data["k1"]),
-            d1=np.asarray(data["d1"]),
-            k2=np.asarray(data["k2"]),
-            d2=np.asarray(data["d2"]),
-            r=np.asarray(data["r"]),
-            t=np.asarray(data["t"]).reshape(3),
-            r1=np.asarray(data["r1"]),
-            r2=np.asarray(data["r2"]),
-            p1=np.asarray(data["p1"]),
-            p2=np.asarray(data["p2"]),
-            q=np.asarray(data["q"]),
-            rms=float(data["rms"]),
-            board_size=tuple(int(x) for x in data["board_size"]),
-            square_size_m=float(data["square_size_m"]),
-            cam1_id=str(data["cam1_id"]),
-            cam2_id=str(data["cam2_id"]),
-            image_size=tuple(int(x) for x in data["image_size"]),
-        )
+        """NPZから読込む（整流パラメータを含まないファイルにも対応）。"""
+        # --- 保存内容は数値配列と文字列のみなので pickle は許可しない
+        with np.load(str(path), allow_pickle=False) as data:
+            rectification = None
+            if all(key in data for key in _RECTIFICATION_KEYS):
+                rectification = tuple(data[key] for key in _RECTIFICATION_KEYS)
+            return StereoParams(
+                k1=data["k1"],
+                d1=data["d1"],
+                k2=data["k2"],
+                d2=data["d2"],
+                r=data["r"],
+                t=data["t"].reshape(3),
+                rms=float(data["rms"]),
+                board_size=tuple(int(x) for x in data["board_size"]),
+                square_size_m=float(data["square_size_m"]),
+                cam1_id=str(data["cam1_id"]),
+                cam2_id=str(data["cam2_id"]),
+                image_size=tuple(int(x) for x in data["image_size"]),
+                rectification=rectification,
+            )
 
 
+@lru_cache(maxsize=16)
 def _make_object_points(
     board_size: tuple[int, int],
     square_size_m: float,
 ) -> np.ndarray:
-    """チェスボード平面上の3D点（Z=0）を生成する。"""
+    """チェスボード平面上の3D点（Z=0）を生成する。
+
+    同じ引数に対しては同一の読み取り専用配列を返す。
+    """
     cols, rows = board_size  # 例：(6, 9) = 横6, 縦9 の内点数
-    objp = np.zeros((rows * cols, 3), dtype=np.float32)
-    objp[:, :2] = np.mgrid[0:cols, 0:rows].T.reshape(-1, 2)
-    objp *= float(square_size_m)
+    objp = np.empty((rows * cols, 3), dtype=np.float32)
+    objp[:, 0] = np.tile(np.arange(cols, dtype=np.float32), rows)
+    objp[:, 1] = np.repeat(np.arange(rows, dtype=np.float32), cols)
+    objp[:, :2] *= float(square_size_m)
+    objp[:, 2] = 0.0
+    objp.setflags(write=False)
     return objp
 
 
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """BGR 画像をスレッドごとに使い回すバッファへグレースケール変換する。"""
+    if image.ndim == 2:
+        return image
+    shape = image.shape[:2]
+    buf = getattr(_GRAY_BUFFERS, "gray", None)
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, dtype=np.uint8)
+        _GRAY_BUFFERS.gray = buf
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=buf)
+
+
+def find_chessboard_corners(
+    image: np.ndarray,
+    board_size: tuple[int, int],
+) -> tuple[bool, np.ndarray | None]:
+    """画像からチェスボードの内点をサブピクセル精度で検出する。
+
+    Parameters
+    ----------
+    image
+        BGR またはグレースケール画像。グレースケールなら変換を省略する。
+    board_size
+        チェスボードの「内点」数 (cols, rows)。
+
+    Returns
+    -------
+    tuple[bool, np.ndarray | None]
+        検出成否と (N,1,2) float32 のコーナー座標。
+    """
+    gray = _to_gray(image)
+    # --- SB 版は検出と同時にサブピクセル推定を行うため cornerSubPix は不要
+    found, corners = cv2.findChessboardCornersSB(
+        gray,
+        board_size,
+        flags=cv2.CALIB_CB_EXHAUSTIVE | cv2.CALIB_CB_ACCURACY,
+    )
+    return bool(found), corners if found else None
+
+
+def find_chessboard_corners_pair(
+    image1: np.ndarray,
+    image2: np.ndarray,
+    board_size: tuple[int, int],
+) -> tuple[tuple[bool, np.ndarray | None], tuple[bool, np.ndarray | None]]:
+    """2 枚の画像のコーナー検出を並行に実行し、それぞれの結果を返す。"""
+    future1 = _CORNER_POOL.submit(find_chessboard_corners, image1, board_size)
+    future2 = _CORNER_POOL.submit(find_chessboard_corners, image2, board_size)
+    return future1.result(), future2.result()
+
+
+def _as_point_list(
+    points: Sequence[np.ndarray],
+) -> list[np.ndarray] | tuple[np.ndarray, ...]:
+    """OpenCV に渡せる点列に変換する（list / tuple はそのまま返す）。"""
+    return points if isinstance(points, (list, tuple)) else list(points)
+
+
 def stereo_calibrate(
     img_points1: Sequence[np.ndarray],
     img_points2: Sequence[np.ndarray],
@@ -117,7 +238,7 @@ def stereo_calibrate(
     ----------
     img_points1, img_points2
         各フレームのチェスボード検出結果。各要素は (N,1,2) float32。
-        （cv2.findChessboardCorners + cornerSubPix の出力を想定）
+        （find_chessboard_corners の出力を想定）
     board_size
         チェスボードの「内点」数 (cols, rows)。
     square_size_m
@@ -137,7 +258,7 @@ def stereo_calibrate(
     assert len(img_points1) == len(img_points2), "対応フレーム数が不一致です。"
     assert len(img_points1) >= 1, "十分な枚数の画像点がありません。"
 
-    # --- 3Dチェスボード座標（Z=0）。各フレーム同一なのでコピーレフ。
+    # --- 3Dチェスボード座標（Z=0）。各フレーム同一なので同じ配列を共有する。
     objp = _make_object_points(board_size, square_size_m)
     obj_points = [objp] * len(img_points1)
 
@@ -149,31 +270,22 @@ def stereo_calibrate(
     )
     flags = cv2.CALIB_FIX_INTRINSIC
 
+    # --- CALIB_FIX_INTRINSIC では内部パラメータは書き換わらないためコピー不要。
+    #     float64 の連続配列で渡し、OpenCV 内部での型変換コピーも避ける。
     rms, k1o, d1o, k2o, d2o, r, t, e, f = cv2.stereoCalibrate(
         objectPoints=obj_points,
-        imagePoints1=list(img_points1),
-        imagePoints2=list(img_points2),
-        cameraMatrix1=k1.copy(),
-        distCoeffs1=d1.copy(),
-        cameraMatrix2=k2.copy(),
-        distCoeffs2=d2.copy(),
+        imagePoints1=_as_point_list(img_points1),
+        imagePoints2=_as_point_list(img_points2),
+        cameraMatrix1=np.ascontiguousarray(k1, dtype=np.float64),
+        distCoeffs1=np.ascontiguousarray(d1, dtype=np.float64),
+        cameraMatrix2=np.ascontiguousarray(k2, dtype=np.float64),
+        distCoeffs2=np.ascontiguousarray(d2, dtype=np.float64),
         imageSize=image_size,
         criteria=criteria,
         flags=flags,
     )
 
-    # --- 整流行列など（後工程で使う可能性があるため保存しておく）
-    r1, r2, p1, p2, q, _, _ = cv2.stereoRectify(
-        cameraMatrix1=k1o,
-        distCoeffs1=d1o,
-        cameraMatrix2=k2o,
-        distCoeffs2=d2o,
-        imageSize=image_size,
-        R=r,
-        T=t,
-        alpha=0,  # 0:切り詰め最大, 1:すべて保持
-    )
-
+    # --- 整流パラメータは必要になった時点で StereoParams 側が計算する
     return StereoParams(
         k1=k1o,
         d1=d1o,
@@ -181,11 +293,6 @@ def stereo_calibrate(
         d2=d2o,
         r=r,
         t=t.reshape(3),
-        r1=r1,
-        r2=r2,
-        p1=p1,
-        p2=p2,
-        q=q,
         rms=float(rms),
         board_size=board_size,
         square_size_m=float(square_size_m),
@@ -225,3 +332,117 @@ def stereo_calibrate_and_save(
     )
     params.save(save_path)
     return params
+
+
+def stereo_calibrate_from_images(
+    image1: np.ndarray,
+    image2: np.ndarray,
+    board_size: tuple[int, int],
+    square_size_m: float,
+    k1: np.ndarray,
+    d1: np.ndarray,
+    k2: np.ndarray,
+    d2: np.ndarray,
+    cam1_id: str,
+    cam2_id: str,
+) -> StereoParams:
+    """2 台で同時に撮影した 1 組の画像からコーナーを検出してステレオ校正する。
+
+    画像サイズは ``image1`` から求める。どちらかの画像でチェスボードを
+    検出できなければ ``ValueError`` を送出する。
+    """
+    (found1, corners1), (found2, corners2) = find_chessboard_corners_pair(
+        image1, image2, board_size
+    )
+    if not (found1 and found2):
+        raise ValueError("チェスボードが検出できませんでした。")
+    return stereo_calibrate(
+        img_points1=[corners1],
+        img_points2=[corners2],
+        board_size=board_size,
+        square_size_m=square_size_m,
+        k1=k1,
+        d1=d1,
+        k2=k2,
+        d2=d2,
+        image_size=(image1.shape[1], image1.shape[0]),
+        cam1_id=cam1_id,
+        cam2_id=cam2_id,
+    )
+
+
+def stereo_calibrate_async(
+    img_points1: Sequence[np.ndarray],
+    img_points2: Sequence[np.ndarray],
+    board_size: tuple[int, int],
+    square_size_m: float,
+    k1: np.ndarray,
+    d1: np.ndarray,
+    k2: np.ndarray,
+    d2: np.ndarray,
+    image_size: tuple[int, int],
+    cam1_id: str,
+    cam2_id: str,
+    on_done: Callable[[StereoParams | Exception], None],
+) -> None:
+    """:func:`stereo_calibrate` をスレッドプールで実行し、結果を ``on_done`` へ渡す。
+
+    ``stereoCalibrate`` / ``stereoRectify`` は GIL を解放するため、
+    GUI スレッドから呼んでもイベントループを止めない。
+    ``on_done`` は呼び出し元スレッドのイベントループ上で、
+    成功時は :class:`StereoParams`、失敗時は発生した例外を引数に呼ばれる。
+    """
+    run_in_thread_pool(
+        partial(
+            stereo_calibrate,
+            img_points1=img_points1,
+            img_points2=img_points2,
+            board_size=board_size,
+            square_size_m=square_size_m,
+            k1=k1,
+            d1=d1,
+            k2=k2,
+            d2=d2,
+            image_size=image_size,
+            cam1_id=cam1_id,
+            cam2_id=cam2_id,
+        ),
+        on_done,
+    )
+
+
+def stereo_calibrate_from_images_async(
+    image1: np.ndarray,
+    image2: np.ndarray,
+    board_size: tuple[int, int],
+    square_size_m: float,
+    k1: np.ndarray,
+    d1: np.ndarray,
+    k2: np.ndarray,
+    d2: np.ndarray,
+    cam1_id: str,
+    cam2_id: str,
+    on_done: Callable[[StereoParams | Exception], None],
+) -> None:
+    """:func:`stereo_calibrate_from_images` をスレッドプールで実行する。
+
+    コーナー検出も校正と同じくワーカースレッドで行うため、GUI スレッドは
+    画像を渡した時点で戻る。``on_done`` の呼ばれ方は
+    :func:`stereo_calibrate_async` と同じ（検出失敗時は ``ValueError``）。
+    """
+    run_in_thread_pool(
+        partial(
+            stereo_calibrate_from_images,
+            image1=image1,
+            image2=image2,
+            board_size=board_size,
+            square_size_m=square_size_m,
+            k1=k1,
+            d1=d1,
+            k2=k2,
+            d2=d2,
+            cam1_id=cam1_id,
+            cam2_id=cam2_id,
+        ),
+        on_done,
+    )
@@ -0,0 +1,63 @@
+# estv/estimators/kernels.py
+"""三角測量の後処理の数値カーネル。
+
+Numba がインストールされていれば 1 つの JIT コンパイル済みループで計算し、
+無ければ同じ結果を NumPy の配列演算で求める。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:     # Numba は任意依存（pip install numba）
+    njit = None
+
+
+def _dehom_and_cheirality_numpy(
+    xh: np.ndarray,
+    r2: np.ndarray,
+    tz: float,
+    x: np.ndarray,
+    mask: np.ndarray,
+) -> None:
+    """``_dehom_and_cheirality_loop`` と同じ計算を NumPy の配列演算で行う（Numba 無し用）。"""
+    np.multiply(xh[:3], np.reciprocal(xh[3]), out=x.T)
+    # カメラ2側は z 成分だけを計算する
+    z2 = x @ r2 + tz
+    np.logical_and(x[:, 2] > 0.0, z2 > 0.0, out=mask)
+
+
+def _dehom_and_cheirality_loop(xh, r2, tz, x, mask):
+    """同次座標 ``xh`` (4, N) を ``x`` (N, 3) へ変換し、チェイラリティを ``mask`` に書き込む。
+
+    ``r2`` はカメラ2の回転行列の 3 行目、``tz`` は並進の z 成分。
+    ``xh`` を 1 回読むだけで、両カメラで z > 0 を満たすかを同時に判定する。
+    """
+    for i in range(xh.shape[1]):
+        w = 1.0 / xh[3, i]
+        x0 = xh[0, i] * w
+        x1 = xh[1, i] * w
+        x2 = xh[2, i] * w
+        x[i, 0] = x0
+        x[i, 1] = x1
+        x[i, 2] = x2
+        z2 = r2[0] * x0 + r2[1] * x1 + r2[2] * x2 + tz
+        mask[i] = x2 > 0.0 and z2 > 0.0
+
+
+# --- 公開するカーネル（Numba があれば JIT 版、無ければ NumPy 版）
+if njit is not None:
+    dehom_and_cheirality = njit(cache=True)(_dehom_and_cheirality_loop)
+else:
+    dehom_and_cheirality = _dehom_and_cheirality_numpy
+
+
+def warm_up() -> None:
+    """JIT 版を使う場合、``triangulatePoints`` の出力と同じ型で事前にコンパイルする。"""
+    if njit is None:
+        return
+    xh = np.ones((4, 1), dtype=np.float64)
+    dehom_and_cheirality(
+        xh, np.zeros(3, dtype=np.float64), 0.0,
+        np.empty((1, 3), dtype=np.float64), np.empty(1, dtype=np.bool_),
+    )
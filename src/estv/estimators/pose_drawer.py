@@ -8,7 +8,10 @@ from estv.estimators.pose_estimator import PoseLandmark
 
 
 # --- 定数
-POSE_CONNECTIONS = list(mp.solutions.pose.POSE_CONNECTIONS)
+POSE_CONNECTIONS = np.array(list(mp.solutions.pose.POSE_CONNECTIONS), dtype=np.int32)  # (M, 2)
+# 描画のたびにそのまま添字として使い回すため、書き換えを禁止しておく
+POSE_CONNECTIONS.setflags(write=False)
+_NUM_POSE_LANDMARKS = int(POSE_CONNECTIONS.max()) + 1
 
 LINE_COLOR = (255, 255, 0)      # 線の色（BGR）
 LINE_THICKNESS = 2              # 線の太さ
@@ -18,53 +21,139 @@ POINT_COLOR = (255, 255, 255)   # ポイントの色（BGR）
 POINT_EDGE_COLOR = (0, 0, 0)    # ポイントの外枠の色（BGR）
 POINT_EDGE_THICKNESS = 2        # ポイントの外枠の太さ
 
+# --- 描画関数が受け付けるランドマーク（リスト形式または構造化配列）
+Landmarks = list[PoseLandmark | None] | np.ndarray
+
+
+def _pose_geometry(
+    landmarks: Landmarks, w: int, h: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """骨格の線分 (K, 2, 2) と有効なキーポイント (P, 2) のピクセル座標を返す。"""
+    # キーポイントのピクセル座標化（欠損点は NaN としてマスクで除外）
+    n = len(landmarks)
+    if isinstance(landmarks, np.ndarray):
+        coords = np.stack((landmarks["x"], landmarks["y"]), axis=1).astype(np.float64)
+    else:
+        coords = np.array(
+            [(lm.x, lm.y) if lm is not None else (np.nan, np.nan) for lm in landmarks],
+            dtype=np.float64,
+        )
+    valid = ~np.isnan(coords[:, 0])
+    points = np.where(valid[:, None], coords * (w, h), 0.0).astype(np.int32)
+
+    # --- 両端が存在する接続だけを抽出
+    conn = POSE_CONNECTIONS if n >= _NUM_POSE_LANDMARKS else POSE_CONNECTIONS[
+        (POSE_CONNECTIONS < n).all(axis=1)
+    ]
+    conn = conn[valid[conn[:, 0]] & valid[conn[:, 1]]]
+    return points[conn], points[valid]
+
+
+def _keypoint_boxes(
+    points: np.ndarray, w: int, h: int
+) -> list[tuple[tuple[slice, slice], tuple[slice, slice]]]:
+    """各キーポイントの外枠・本体の塗り範囲（画像内にクリップ済み）を返す。"""
+    outer = POINT_SIZE // 2 + 1 + POINT_EDGE_THICKNESS // 2
+    inner = POINT_SIZE // 2
+    limit = (w, h)
+    edge_lo = np.clip(points - outer, 0, limit)
+    edge_hi = np.clip(points + outer + 1, 0, limit)
+    body_lo = np.clip(points - inner, 0, limit)
+    body_hi = np.clip(points + inner + 1, 0, limit)
+    return [
+        (
+            (slice(ey0, ey1), slice(ex0, ex1)),
+            (slice(by0, by1), slice(bx0, bx1)),
+        )
+        for (ex0, ey0), (ex1, ey1), (bx0, by0), (bx1, by1) in zip(
+            edge_lo.tolist(), edge_hi.tolist(), body_lo.tolist(), body_hi.tolist()
+        )
+    ]
+
 
 def draw_pose_landmarks(
     image: np.ndarray,
-    landmarks: list[PoseLandmark | None]
+    landmarks: Landmarks,
+    in_place: bool = False,
 ) -> np.ndarray:
-    """画像にMediaPipe Pose骨格を描画して返す。"""
+    """画像にMediaPipe Pose骨格を描画して返す。
 
-    if not landmarks:
+    ``landmarks`` は :class:`PoseLandmark` のリストか ``LANDMARK_DTYPE`` の構造化配列。
+    ``in_place`` が真なら ``image`` に直接描画し、複製を作らない。
+    """
+
+    if len(landmarks) == 0:
         return image
 
-    img = image.copy()
+    img = image if in_place else image.copy()
     h, w = img.shape[:2]
+    segments, points = _pose_geometry(landmarks, w, h)
 
-    # キーポイントのピクセル座標化
-    points = [
-        (int(lm.x * w), int(lm.y * h)) if lm is not None else None
-        for lm in landmarks
-    ]
-
-    # --- 骨格ライン描画
-    for idx1, idx2 in POSE_CONNECTIONS:
-        pt1 = points[idx1] if idx1 < len(points) else None
-        pt2 = points[idx2] if idx2 < len(points) else None
-        if pt1 and pt2:
-            cv2.line(img, pt1, pt2, LINE_COLOR, LINE_THICKNESS, lineType=cv2.LINE_AA)
+    # --- 骨格ライン描画（全接続を 1 回の呼び出しで描く）
+    if len(segments):
+        cv2.polylines(
+            img, segments, isClosed=False, color=LINE_COLOR,
+            thickness=LINE_THICKNESS, lineType=cv2.LINE_AA,
+        )
 
     # --- キーポイント描画
-    for pt in points:
-        if pt:
-            x, y = pt
-            # 外枠
-            cv2.rectangle(
-                img,
-                (x - POINT_SIZE // 2 - 1, y - POINT_SIZE // 2 - 1),
-                (x + POINT_SIZE // 2 + 1, y + POINT_SIZE // 2 + 1),
-                POINT_EDGE_COLOR,
-                thickness=POINT_EDGE_THICKNESS,
-                lineType=cv2.LINE_AA
-            )
-            # 本体
-            cv2.rectangle(
-                img,
-                (x - POINT_SIZE // 2, y - POINT_SIZE // 2),
-                (x + POINT_SIZE // 2, y + POINT_SIZE // 2),
-                POINT_COLOR,
-                thickness=-1,
-                lineType=cv2.LINE_AA
-            )
+    # 数ピクセルの正方形なので cv2.rectangle を使わずスライス代入で塗る
+    for edge, body in _keypoint_boxes(points, w, h):
+        img[edge] = POINT_EDGE_COLOR  # 外枠
+        img[body] = POINT_COLOR       # 本体
 
     return img
+
+
+class PoseOverlay:
+    """推定結果 1 回分の骨格を描画済みレイヤーとして保持する。
+
+    推論はカメラより低いレートで結果を返すため、同じ骨格を複数フレームに
+    重ねることになる。描画は生成時の 1 回だけ行い、各フレームには
+    骨格が掛かる画素だけをアルファ合成する。
+    """
+
+    def __init__(self, landmarks: Landmarks, shape: tuple[int, ...]) -> None:
+        self.landmarks = landmarks
+        self.shape = tuple(shape)
+        h, w = self.shape[:2]
+
+        # --- 線はカバレッジ（アンチエイリアス込み）を 1ch に描き、色は後で掛ける
+        alpha = np.zeros((h, w), dtype=np.uint8)
+        color = np.empty((h, w, 3), dtype=np.uint8)
+        color[:] = LINE_COLOR
+        if len(landmarks):
+            segments, points = _pose_geometry(landmarks, w, h)
+            if len(segments):
+                cv2.polylines(
+                    alpha, segments, isClosed=False, color=255,
+                    thickness=LINE_THICKNESS, lineType=cv2.LINE_AA,
+                )
+            for edge, body in _keypoint_boxes(points, w, h):
+                alpha[edge] = 255
+                color[edge] = POINT_EDGE_COLOR
+                alpha[body] = 255
+                color[body] = POINT_COLOR
+
+        # --- 骨格が掛かる画素だけを、不透明部と縁（半透明）に分けてバイト単位で保持
+        channels = np.arange(3)
+        colors = color.reshape(-1)
+        opaque = np.flatnonzero(alpha == 255)
+        self._opaque_index = (opaque[:, None] * 3 + channels).ravel()
+        self._opaque_value = colors[self._opaque_index]
+        partial = np.flatnonzero((alpha > 0) & (alpha < 255))
+        self._partial_index = (partial[:, None] * 3 + channels).ravel()
+        a = np.repeat(alpha.ravel()[partial], 3).astype(np.uint16)
+        # out = (背景 * (255 - a) + 色 * a) / 255 を uint16 の範囲で計算する
+        self._partial_keep = 255 - a
+        self._partial_paint = colors[self._partial_index] * a + 127
+
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        """``image``（C 連続の BGR 画像）に骨格を直接合成して返す。"""
+        np.put(image, self._opaque_index, self._opaque_value)
+        if self._partial_index.size:
+            background = np.take(image, self._partial_index).astype(np.uint16)
+            blended = (background * self._partial_keep + self._partial_paint) // 255
+            np.put(image, self._partial_index, blended.astype(np.uint8))
+        return image
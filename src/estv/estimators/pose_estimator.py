@@ -1,9 +1,21 @@
 # estv/estimators/pose_estimator.py
 
+import threading
+
+import cv2
 import mediapipe as mp
 import numpy as np
 
 
+# --- 推論結果 1 フレーム分のランドマーク配列の要素型（部位順に並ぶ構造化配列）
+LANDMARK_DTYPE = np.dtype([
+    ("x", np.float32),
+    ("y", np.float32),
+    ("z", np.float32),
+    ("visibility", np.float32),
+])
+
+
 class PoseLandmark:
     """推論結果として返すキーポイント情報"""
 
@@ -18,6 +30,29 @@ class PoseLandmark:
         return self.x, self.y, self.z, self.visibility
 
 
+def landmarks_from_array(landmarks: np.ndarray) -> list[PoseLandmark | None]:
+    """構造化配列のランドマークを :class:`PoseLandmark` のリストに変換する
+
+    信頼度が閾値未満（座標が NaN）の部位は ``None`` になる。
+    """
+    return [
+        PoseLandmark(x, y, z, v) if x == x else None  # NaN は自身と一致しない
+        for x, y, z, v in landmarks.tolist()
+    ]
+
+
+def landmark_xyz(landmarks: np.ndarray) -> np.ndarray:
+    """構造化配列のランドマークから (N, 3) の float32 座標ビューを返す（コピーしない）
+
+    ``estimate_array`` の戻り値と同じ ``LANDMARK_DTYPE`` の C 連続配列のみ受け付け、
+    それ以外は ``ValueError`` を送出する。欠損部位は NaN のまま。
+    ビューは元の配列と同じメモリを指す。
+    """
+    if landmarks.dtype != LANDMARK_DTYPE or not landmarks.flags.c_contiguous:
+        raise ValueError("LANDMARK_DTYPE の C 連続配列が必要です。")
+    return landmarks.view(np.float32).reshape(-1, 4)[:, :3]
+
+
 class PoseEstimator:
     """MediaPipe Poseを用いた姿勢推定モジュール（CPU動作）"""
 
@@ -31,28 +66,95 @@ class PoseEstimator:
             min_tracking_confidence=min_tracking_confidence
         )
         self.visibility_th = visibility_th
+        # RGB 変換の出力先（入力サイズが変わるまで使い回す）
+        self._rgb_buf: np.ndarray | None = None
 
 
     def estimate(self, frame: np.ndarray) -> list[PoseLandmark | None]:
         """BGR画像（np.ndarray）を受け取り、ランドマーク情報リストを返す"""
+        return landmarks_from_array(self.estimate_array(frame))
+
+
+    def estimate_array(self, frame: np.ndarray) -> np.ndarray:
+        """BGR画像を受け取り、ランドマークを ``LANDMARK_DTYPE`` の構造化配列で返す
+
+        部位順の (33,) 配列（未検出時は長さ 0）。信頼度が閾値未満の部位は
+        x, y, z が NaN になる。部位ごとの Python オブジェクトを生成しないため、
+        描画などの後段処理をそのままベクトル化できる。
+        """
         # MediaPipeはRGB入力が必要
-        image_rgb = frame[..., ::-1]
+        # 逆順ストライドのビューは MediaPipe 側で連続配列へコピーされるため、
+        # 使い回しのバッファへ直接変換する
+        # バッファは入力のメモリ配置に関わらず C 連続で確保する
+        # （empty_like は F 順の入力に対して F 順の配列を返し、cvtColor が受け付けない）
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty(frame.shape, dtype=np.uint8)
+        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
 
         # 推論
         results = self.pose.process(image_rgb)
 
         if not results.pose_landmarks:
-            return []
+            return np.empty(0, dtype=LANDMARK_DTYPE)
+
+        values = np.array(
+            [(lm.x, lm.y, lm.z, lm.visibility) for lm in results.pose_landmarks.landmark],
+            dtype=np.float32,
+        )
+        values[values[:, 3] < self.visibility_th, :3] = np.nan  # 部位順は維持
+        return values.view(LANDMARK_DTYPE).reshape(-1)
 
-        landmarks = []
-        for lm in results.pose_landmarks.landmark:
-            if lm.visibility >= self.visibility_th:
-                landmarks.append(PoseLandmark(lm.x, lm.y, lm.z, lm.visibility))
-            else:
-                landmarks.append(None)  # Noneで埋めて部位順維持
-        return landmarks
+
+    def reset(self) -> None:
+        """トラッキング状態を破棄し、別の映像に使えるようにする"""
+        self.pose.reset()
 
 
     def close(self) -> None:
         """リソース解放"""
         self.pose.close()
+
+
+class PoseEstimatorPool:
+    """カメラ間で使い回す :class:`PoseEstimator` のプール
+
+    MediaPipe のグラフはスレッドセーフではないため、1 インスタンスは同時に
+    1 ワーカーだけが使う（カメラごとに別グラフを並行実行する）。
+    返却されたインスタンスはグラフをリセットして保持し、次の推定開始時に
+    グラフ生成とモデルの初回読み込みを省く。
+    """
+
+    def __init__(self, max_idle: int = 4) -> None:
+        self._max_idle = max_idle
+        self._idle: list[PoseEstimator] = []
+        self._lock = threading.Lock()
+
+
+    def acquire(self) -> PoseEstimator:
+        """未使用の推定器を取り出す（無ければ新規に生成する）"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return PoseEstimator()
+
+
+    def release(self, estimator: PoseEstimator) -> None:
+        """推定器を返却する（保持数を超える分は解放する）"""
+        estimator.reset()
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(estimator)
+                return
+        estimator.close()
+
+
+    def close(self) -> None:
+        """保持している推定器をすべて解放する"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for estimator in idle:
+            estimator.close()
+
+
+# --- アプリ全体で共有するプール（推定器は必要になった時点で生成）
+POSE_ESTIMATOR_POOL = PoseEstimatorPool()
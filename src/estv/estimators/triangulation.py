@@ -4,16 +4,35 @@ import numpy as np
 import cv2
 
 from estv.devices.stereo_calibrator import StereoParams
+from estv.estimators import kernels
 
 
 class OpenCVTriangulator:
     """StereoParams を用いて OpenCV の三角測量を行うクラス。"""
 
+    _warmed_up = False  # JIT カーネルのコンパイルはプロセスで 1 回だけ行う
+
+
     def __init__(self, params: StereoParams) -> None:
         self.params = params
+        # 最初のフレームでコンパイル待ちが発生しないよう、構築時に済ませておく
+        if not OpenCVTriangulator._warmed_up:
+            kernels.warm_up()
+            OpenCVTriangulator._warmed_up = True
+        # --- パラメータは不変なので float64 化・回転ベクトル化は一度だけ行う
+        self._k1 = np.asarray(params.k1, dtype=np.float64)
+        self._d1 = np.asarray(params.d1, dtype=np.float64)
+        self._k2 = np.asarray(params.k2, dtype=np.float64)
+        self._d2 = np.asarray(params.d2, dtype=np.float64)
+        self._r = np.asarray(params.r, dtype=np.float64)
+        self._t = np.asarray(params.t, dtype=np.float64).reshape(3)
+        self._rvec1 = np.zeros((3, 1), dtype=np.float64)
+        self._tvec1 = np.zeros((3, 1), dtype=np.float64)
+        self._rvec2, _ = cv2.Rodrigues(self._r)
+        self._tvec2 = self._t.reshape(3, 1)
         # --- 正規化座標前提の射影行列
-        self._p1 = np.hstack([np.eye(3), np.zeros((3, 1))]).astype(np.float64)
-        self._p2 = np.hstack([params.r, params.t.reshape(3, 1)]).astype(np.float64)
+        self._p1 = np.hstack([np.eye(3), np.zeros((3, 1))])
+        self._p2 = np.hstack([self._r, self._tvec2])
 
 
     def triangulate(
@@ -40,35 +59,31 @@ class OpenCVTriangulator:
         pts2_px = np.asarray(pts2_px, dtype=np.float64)
 
         # --- (u,v)->正規化(x,y)
-        p = self.params
-        pts1 = cv2.undistortPoints(pts1_px.reshape(-1, 1, 2), p.k1, p.d1).reshape(-1, 2)
-        pts2 = cv2.undistortPoints(pts2_px.reshape(-1, 1, 2), p.k2, p.d2).reshape(-1, 2)
+        # 事前計算した歪み補正 LUT の双線形補間は 1000 点規模でも
+        # undistortPoints より遅かったため、点ごとの反復解法をそのまま使う
+        pts1 = cv2.undistortPoints(pts1_px.reshape(-1, 1, 2), self._k1, self._d1).reshape(-1, 2)
+        pts2 = cv2.undistortPoints(pts2_px.reshape(-1, 1, 2), self._k2, self._d2).reshape(-1, 2)
 
         xh = cv2.triangulatePoints(self._p1, self._p2, pts1.T, pts2.T)  # 4xN
-        x = (xh[:3] / xh[3]).T  # (N,3)
-
-        # --- チェイラリティ
-        z1 = x[:, 2]
-        x2 = (p.r @ x.T + p.t.reshape(3, 1)).T
-        z2 = x2[:, 2]
-        mask = (z1 > 0.0) & (z2 > 0.0)
+        # --- 同次化とチェイラリティ判定（Numba があれば 1 回のループにまとめる）
+        n = xh.shape[1]
+        x = np.empty((n, 3), dtype=np.float64)
+        mask = np.empty(n, dtype=np.bool_)
+        kernels.dehom_and_cheirality(xh, self._r[2], float(self._t[2]), x, mask)
         return x, mask
 
 
     def reprojection_rmse(
         self, X: np.ndarray, pts1_px: np.ndarray, pts2_px: np.ndarray
     ) -> float:
-        """デバッグ用：再投影RMSE（px）。"""
-        p = self.params
-        rvec1 = np.zeros((3, 1), dtype=np.float64)
-        tvec1 = np.zeros((3, 1), dtype=np.float64)
-        rvec2, _ = cv2.Rodrigues(p.r.astype(np.float64))
-        tvec2 = p.t.reshape(3, 1).astype(np.float64)
-
-        proj1, _ = cv2.projectPoints(X, rvec1, tvec1, p.k1, p.d1)
-        proj2, _ = cv2.projectPoints(X, rvec2, tvec2, p.k2, p.d2)
-        e = np.vstack([
-            (proj1.reshape(-1, 2) - pts1_px).ravel(),
-            (proj2.reshape(-1, 2) - pts2_px).ravel(),
-        ])
-        return float(np.sqrt(np.mean(e**2)))
+        """デバッグ用：再投影RMSE（px）。
+
+        数十点を対象にたまに呼ぶだけのデバッグ用なので、JIT カーネルにはしない。
+        """
+        proj1, _ = cv2.projectPoints(X, self._rvec1, self._tvec1, self._k1, self._d1)
+        proj2, _ = cv2.projectPoints(X, self._rvec2, self._tvec2, self._k2, self._d2)
+        # --- 二乗誤差和を内積で直接求める（連結・二乗の一時配列を作らない）
+        e1 = (proj1.reshape(-1, 2) - pts1_px).ravel()
+        e2 = (proj2.reshape(-1, 2) - pts2_px).ravel()
+        total = np.dot(e1, e1) + np.dot(e2, e2)
+        return float(np.sqrt(total / (e1.size + e2.size)))
@@ -2,6 +2,7 @@
 """カメラプレビュー表示およびキャリブレーションを行うウィンドウ。"""
 
 from collections.abc import Callable
+from functools import lru_cache
 from filelock import FileLock
 import json
 import logging
@@ -9,21 +10,26 @@ import os
 from pathlib import Path
 import re
 import sys
+import threading
+import time
 
 import cv2
 import numpy as np
 from PySide6.QtCore import (
     Qt,
+    QRect,
     QTimer,
     QObject,
     QThread,
+    QThreadPool,
     Signal,
     Slot,
 )
 from PySide6.QtGui import (
     QCloseEvent,
     QImage,
-    QPixmap,
+    QPainter,
+    QPaintEvent,
 )
 from PySide6.QtWidgets import (
     QDialog,
@@ -37,10 +43,15 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from estv.devices.camera_calibrator import CameraCalibrator
+from estv.devices.camera_calibrator import (
+    CameraCalibrator,
+    add_chessboard_image_async,
+    calibrate_and_save_async,
+)
+from estv.devices.camera_stream import CAPTURE_FPS
 from estv.devices.camera_stream_manager import CameraStreamManager
-from estv.estimators.pose_drawer import draw_pose_landmarks
-from estv.estimators.pose_estimator import PoseEstimator
+from estv.estimators.pose_drawer import PoseOverlay
+from estv.estimators.pose_estimator import POSE_ESTIMATOR_POOL, PoseEstimator
 from estv.gui.style_constants import (
     BACKGROUND_COLOR,
     SUBTEXT_COLOR,
@@ -55,10 +66,18 @@ logger = logging.getLogger(__name__)
 # --- 定数
 CALIB_IMAGES_REQUIRED = 20        # キャリブレーションに必要な枚数
 CALIB_CAPTURE_INTERVAL_MS = 500   # キャプチャ間隔 (ミリ秒)
+# チェスボード検出に回すフレームの間隔（この枚数ごとに 1 枚、約 CALIB_CAPTURE_INTERVAL_MS 間隔）
+CALIB_CAPTURE_FRAME_STRIDE = max(1, CAPTURE_FPS * CALIB_CAPTURE_INTERVAL_MS // 1000)
+SETTINGS_SAVE_DELAY_MS = 200      # スライダー操作が止まってから設定を保存するまでの時間 (ミリ秒)
+PREVIEW_MIN_INTERVAL_MS = 33      # プレビューを描き直す最短間隔 (ミリ秒、約 30 Hz)
+
+# --- ファイル名に使えない文字（デバイスIDから置き換える）
+_UNSAFE_ID_CHARS = re.compile(r"[^A-Za-z0-9._-]")
 
 
+@lru_cache(maxsize=1)
 def _get_data_dir() -> Path:
-    """exe化にも対応した data/ ディレクトリ取得"""
+    """exe化にも対応した data/ ディレクトリ取得（初回のみ作成し、以降は結果を使い回す）"""
     # exeの場合はexeと同じ場所/data/
     if getattr(sys, 'frozen', False):
         base_dir = Path(sys.executable).parent
@@ -69,42 +88,204 @@ def _get_data_dir() -> Path:
     return data_dir
 
 
+def _safe_device_id(device_id: str) -> str:
+    """デバイスIDをファイル名に使える形へ変換する。"""
+    return _UNSAFE_ID_CHARS.sub("_", device_id)
+
+
 def _calib_file_path(device_id: str) -> str:
     """デバイスIDからキャリブレーションファイルパスを返す（exe対応）"""
-    safe_id = re.sub(r"[^A-Za-z0-9._-]", "_", device_id)
-    return str(_get_data_dir() / f"calib_{safe_id}.npz")
+    return str(_get_data_dir() / f"calib_{_safe_device_id(device_id)}.npz")
 
 
 def _settings_file_path(device_id: str) -> str:
     """デバイスIDごとのカメラ設定ファイルパスを返す。"""
-    safe_id = re.sub(r"[^A-Za-z0-9._-]", "_", device_id)
-    return str(_get_data_dir() / f"settings_{safe_id}.json")
+    return str(_get_data_dir() / f"settings_{_safe_device_id(device_id)}.json")
+
+
+class _SettingsWriter:
+    """設定 JSON を GUI スレッド外（``QThreadPool``）で書き出すライター。
+
+    書き込み中に届いた要求は最新の 1 件だけを保持し、書き終わり次第まとめて書く。
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._cond = threading.Condition()
+        self._pending: dict | None = None   # 未書き込みの最新データ
+        self._scheduled = False             # プールにタスクを投入済みか
+        self._writing = False               # 書き込み実行中か
+
+
+    def request_save(self, data: dict) -> None:
+        """``data`` の保存を予約してすぐに戻る。"""
+        with self._cond:
+            self._pending = data
+            if self._scheduled:
+                return
+            self._scheduled = True
+        QThreadPool.globalInstance().start(self._drain)
+
+
+    def flush(self) -> None:
+        """保留中のデータを呼び出し元スレッドで書き、実行中の書き込みの完了も待つ。"""
+        with self._cond:
+            data, self._pending = self._pending, None
+            while self._writing:
+                self._cond.wait()
+            if data is None:
+                return
+            self._writing = True
+        try:
+            self._write(data)
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+    def _drain(self) -> None:
+        """保留中のデータが無くなるまで書き込む（プールのスレッドで実行）。"""
+        while True:
+            with self._cond:
+                data, self._pending = self._pending, None
+                if data is None:
+                    self._scheduled = False
+                    return
+                while self._writing:
+                    self._cond.wait()
+                self._writing = True
+            try:
+                self._write(data)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+
+    def _write(self, data: dict) -> None:
+        # --- 一時ファイルに書き出してから置き換え、読み手に途中状態を見せない
+        tmp_path = self._path + ".tmp"
+        try:
+            with FileLock(self._path + ".lock"):
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self._path)
+        except Exception as e:
+            logger.error("カメラ設定保存失敗: %s", e)
 
 
 class PoseEstimationWorker(QObject):
-    """別スレッドで姿勢推定を実行するワーカー。"""
+    """別スレッドで姿勢推定を実行するワーカー。
+
+    ``submit`` で渡された最新フレームを 1 枚だけ保持し、推論が終わるたびに
+    GUI スレッドを経由せず次のフレームへ進む。推論中に届いた古いフレームは捨てる。
+    """
 
     result_ready = Signal(object)
+    _wake = Signal()
 
     def __init__(self) -> None:
         super().__init__()
-        self._estimator = PoseEstimator()
+        # --- 推定器は共有プールから借り、停止時に返却して次回に使い回す
+        # グラフ生成（モデル読み込み）が GUI スレッドで走らないよう、最初のフレームで借りる
+        self._estimator: PoseEstimator | None = None
+        # --- 次に推論するフレーム（GUI スレッドとワーカースレッドで共有）
+        self._lock = threading.Lock()
+        self._latest: np.ndarray | None = None
+        self._scheduled = False
+        self._stopped = False
+        self._wake.connect(self._drain, Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, frame: np.ndarray) -> None:
+        """推論対象のフレームを渡す（任意のスレッドから呼べる）。"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._latest = frame
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._wake.emit()
 
-    @Slot(object)
-    def process_frame(self, frame: np.ndarray) -> None:
-        landmarks = self._estimator.estimate(frame)
-        self.result_ready.emit(landmarks)
+    @Slot()
+    def _drain(self) -> None:
+        """保持中のフレームが無くなるまで推論を続ける。"""
+        while True:
+            with self._lock:
+                frame, self._latest = self._latest, None
+                if frame is None:
+                    self._scheduled = False
+                    return
+            if self._estimator is None:
+                self._estimator = POSE_ESTIMATOR_POOL.acquire()
+            landmarks = self._estimator.estimate_array(frame)
+            # 骨格の描画（ラスタライズ）もこのスレッドで済ませ、GUI 側は合成のみ行う
+            self.result_ready.emit(PoseOverlay(landmarks, frame.shape))
+
+    def stop(self) -> None:
+        """以降のフレームを受け付けず、保持中のフレームも破棄する。"""
+        with self._lock:
+            self._stopped = True
+            self._latest = None
 
     @Slot()
     def close(self) -> None:
-        self._estimator.close()
+        if self._estimator is not None:
+            POSE_ESTIMATOR_POOL.release(self._estimator)
+            self._estimator = None
+
+
+class _PreviewLabel(QLabel):
+    """最新フレームをアスペクト比を保って直接描画するラベル。
+
+    フレームごとに ``QPixmap`` を生成・拡大して ``setPixmap`` する代わりに、
+    使い回しの 32bit バッファへ変換して再描画を要求し、``paintEvent`` で
+    表示サイズへ描き込む。フレームが届くまではラベルのテキストを表示する。
+    """
+
+    def __init__(self, text: str) -> None:
+        super().__init__(text)
+        # 表示用の BGRA バッファと、それを共有する QImage（解像度が変わるまで使い回す）
+        self._buf: np.ndarray | None = None
+        self._image: QImage | None = None
+
+
+    def set_frame(self, frame: np.ndarray) -> None:
+        """表示する BGR フレームを差し替えて再描画を予約する。"""
+        h, w = frame.shape[:2]
+        if self._buf is None or self._buf.shape[:2] != (h, w):
+            if self._buf is None:
+                self.setText("")
+            self._buf = np.empty((h, w, 4), dtype=np.uint8)
+            # リトルエンディアンの RGB32 はメモリ上 BGRA の順に並ぶ
+            self._image = QImage(self._buf.data, w, h, 4 * w, QImage.Format.Format_RGB32)
+        # 描画先と同じ 32bit 形式にしておくと、描画時の形式変換が不要になる
+        # ここでは UMat (OpenCL) を使わない。QImage はホストメモリを要するため
+        # GPU への転送と読み戻しが必ず発生し、縮小済みフレームの 1 回の変換では
+        # その往復の方が高くつく（OpenCL によるオフロードはキャプチャスレッド側で行う）
+        cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA, dst=self._buf)
+        self.update()
+
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        super().paintEvent(event)
+        image = self._image
+        if image is None:
+            return
+        area = self.contentsRect()
+        size = image.size().scaled(area.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        target = QRect(0, 0, size.width(), size.height())
+        target.moveCenter(area.center())
+        # プレビュー表示用なので拡大は最近傍補間で行う（SmoothPixmapTransform は付けない）
+        painter = QPainter(self)
+        painter.drawImage(target, image)
+        painter.end()
 
 
 class CameraPreviewWindow(QDialog):
     """カメラのプレビューウィンドウ＋キャリブレーション制御。"""
 
-    inference_input = Signal(object)
-
     def __init__(
         self,
         camera_stream_manager: CameraStreamManager,
@@ -135,37 +316,47 @@ class CameraPreviewWindow(QDialog):
         self._pose_estimation_enabled = False
         self._pose_thread: QThread | None = None
         self._pose_worker: PoseEstimationWorker | None = None
-        self._last_landmarks: list | None = None
-        self._inference_busy = False
+        # 骨格描画用の作業バッファ（_last_image は推論・キャリブでも参照されるため直接描かない）
+        self._overlay_buf: np.ndarray | None = None
+        # 最新推定結果の描画済み骨格（ワーカーが生成し、次の結果まで各フレームで使い回す）
+        self._pose_overlay: PoseOverlay | None = None
         # MainWindow からの強制閉鎖時に推定状態を無視するフラグ
         self._force_close = False
+        # カメラ停止中で、閉じずに隠しているか（suspend / resume）
+        self._suspended = False
 
         # --- キャリブ関連
         self.calibrator = CameraCalibrator()
         self.calibrating = False
         self.calibration_done = False
+        # キャリブ開始から届いたフレーム数（検出は CALIB_CAPTURE_FRAME_STRIDE 枚ごと）
         self._frame_count = 0
         self._last_image = None
+        # チェスボード検出（スレッドプール）の実行中か
+        self._calib_detecting = False
+        # キャリブレーション計算（スレッドプール）の実行中か
+        self._calib_computing = False
         self._first_frame_received = False
 
         # --- カメラ設定読み込み
         settings_path = _settings_file_path(self.device_id)
         self._exposure_value = -7
         self._brightness_value = 0
-        if os.path.exists(settings_path):
-            lock_path = settings_path + ".lock"
-            try:
-                with FileLock(lock_path):
-                    with open(settings_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                self._exposure_value = int(data.get("exposure", 0))
-                self._brightness_value = int(data.get("brightness", 0))
-            except Exception as e:
-                logger.error("カメラ設定読み込み失敗: %s", e)
+        # 存在確認を別に行わず、開けなければ既定値のままにする
+        try:
+            with FileLock(settings_path + ".lock"):
+                with open(settings_path, "rb") as f:
+                    data = json.loads(f.read())
+            self._exposure_value = int(data.get("exposure", 0))
+            self._brightness_value = int(data.get("brightness", 0))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("カメラ設定読み込み失敗: %s", e)
 
         # --- UI構成
         # --- Preview グループ
-        self.image_label = QLabel("カメラ映像がここに表示されます")
+        self.image_label = _PreviewLabel("カメラ映像がここに表示されます")
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.image_label.setStyleSheet(f"""
             background-color: {BACKGROUND_COLOR};
@@ -202,6 +393,13 @@ class CameraPreviewWindow(QDialog):
         calib_group.setLayout(calib_layout)
 
         # --- Config グループ
+        # ドラッグ中は値が連続で届くため、保存は操作が止まってから 1 回だけ行う
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SETTINGS_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._save_settings)
+        self._settings_writer = _SettingsWriter(_settings_file_path(self.device_id))
+
         self.exposure_slider = QSlider(Qt.Orientation.Horizontal)
         self.exposure_slider.setRange(-13, -1)
         self.exposure_slider.setValue(self._exposure_value)
@@ -231,123 +429,143 @@ class CameraPreviewWindow(QDialog):
         self.adjustSize()
         self.setFixedSize(self.size())
 
+        # --- プレビュー描画用タイマー
+        # フレーム到着時に 1 回だけ予約し、発火時点の最新フレームを描く
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.timeout.connect(self._render_latest_frame)
+        self._last_render_time = 0.0
+
         # --- シグナル接続
-        self._on_image_ready_slot = lambda cid, img: self._on_image_ready(cid, img)
-        self.camera_stream_manager.q_image_ready.connect(self._on_image_ready_slot)
-        self.camera_stream_manager.frame_ready.connect(self._on_frame_ready)
+        # 表示も配列から行うため、フレームごとの通知は frame_ready の 1 本だけ受け取る
+        # マネージャーは GUI スレッド上で再発行するため、直接接続で発行ごとのスレッド判定を省く
+        self.camera_stream_manager.frame_ready.connect(
+            self._on_frame_ready, Qt.ConnectionType.DirectConnection
+        )
 
         self.camera_stream_manager.set_exposure(self.device_id, self._exposure_value)
         self.camera_stream_manager.set_brightness(self.device_id, self._brightness_value)
 
         # --- キャリブレーションパラメータ自動ロード
+        # 保存されるのは 3x3 行列と歪み係数だけで、読み込みは 1 ms 未満のため同期で行う。
+        # 非同期にすると、生成直後に MainWindow が参照する calibration_done が
+        # 一時的に偽になり、ボタン状態の更新が二度手間になる
         calib_path = _calib_file_path(self.device_id)
-        if os.path.exists(calib_path):
-            try:
-                self.calibrator.load(calib_path)
-                self.calibration_done = True
-                self.progress_bar_value_on_load = True
-                self.progress_bar.setValue(self.progress_bar.maximum())
-            except Exception as e:
-                logger.error("キャリブレーションパラメータ読み込み失敗: %s", e)
-                self.progress_bar_value_on_load = False
-        else:
+        try:
+            self.calibrator.load(calib_path)
+            self.calibration_done = True
+            self.progress_bar_value_on_load = True
+            self.progress_bar.setValue(self.progress_bar.maximum())
+        except FileNotFoundError:
+            self.progress_bar_value_on_load = False
+        except Exception as e:
+            logger.error("キャリブレーションパラメータ読み込み失敗: %s", e)
             self.progress_bar_value_on_load = False
-        
-        # --- キャリブ用タイマー
-        self._calib_timer = QTimer(self)
-        self._calib_timer.setInterval(CALIB_CAPTURE_INTERVAL_MS)  # 0.5秒ごと
-        self._calib_timer.timeout.connect(self._on_calib_frame_timer)
 
         self._update_status_label()
         # 最低１つキャリブ済みプレビューができたら、MainWindow のグローバルボタンを更新
         main_win = parent
-        if hasattr(main_win, "_update_global_est_button_state"):
-            main_win._update_global_est_button_state()
-        if hasattr(main_win, "_update_stereo_button_state"):
-            main_win._update_stereo_button_state()
+        if hasattr(main_win, "_update_controls_state"):
+            main_win._update_controls_state()
 
 
-    def _on_image_ready(self, device_id: str, qimg: QImage) -> None:
-        if device_id != self.device_id:
+    def _schedule_render(self) -> None:
+        """プレビューの描画を予約する。"""
+        # 見えていない間は合成・変換・描画をすべて省く（推定用のフレーム保持は継続）
+        if not self.isVisible() or self.isMinimized():
+            return
+        # 描画は予約済みならそれに任せる。GUI スレッドが詰まって複数フレームが
+        # まとめて届いても、描くのは最新の 1 枚だけで、間隔も最短間隔以上に保つ
+        if self._render_timer.isActive():
+            return
+        elapsed_ms = (time.perf_counter() - self._last_render_time) * 1000.0
+        self._render_timer.start(max(0, int(PREVIEW_MIN_INTERVAL_MS - elapsed_ms)))
+
+
+    def _render_latest_frame(self) -> None:
+        """最新フレーム（姿勢推定中は骨格を重畳）をプレビューに描く。"""
+        self._last_render_time = time.perf_counter()
+        frame = self._last_image
+        if frame is None:
             return
 
         # もし姿勢推定オンなら最新推定結果で骨格を重畳
         if (
             self._pose_estimation_enabled
-            and self._last_image is not None
-            and self._last_landmarks is not None
+            and self._pose_overlay is not None
+            # 解像度が変わった直後は次の推定結果が届くまで重畳しない
+            and self._pose_overlay.shape == frame.shape
         ):
-            img_pose = draw_pose_landmarks(self._last_image, self._last_landmarks)
-            rgb = cv2.cvtColor(img_pose, cv2.COLOR_BGR2RGB)
-            h, w, _ = rgb.shape
-            qimg = QImage(rgb.data, w, h, 3 * w, QImage.Format.Format_RGB888).copy()
-
-        self.image_label.setPixmap(
-            QPixmap.fromImage(qimg).scaled(
-                self.image_label.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-        )
+            if self._overlay_buf is None or self._overlay_buf.shape != frame.shape:
+                self._overlay_buf = np.empty_like(frame)
+            np.copyto(self._overlay_buf, frame)
+            frame = self._pose_overlay.apply(self._overlay_buf)
+
+        # 中間の QPixmap を作らず、ラベルの再描画時に表示サイズへ直接描き込む
+        self.image_label.set_frame(frame)
 
 
+    @Slot(str, object)
     def _on_frame_ready(self, device_id: str, frame: np.ndarray) -> None:
-        """キャリブレーション用に最新フレームを保持し推定を要求する。"""
+        """最新フレームを保持し、プレビューの描画と推定を要求する。"""
         if device_id != self.device_id:
             return
         self._last_image = frame
         if not self._first_frame_received:
             self._first_frame_received = True
             main_win = self.parent()
-            if hasattr(main_win, "_update_stereo_button_state"):
-                main_win._update_stereo_button_state()
-        if (
-            self._pose_estimation_enabled
-            and self._pose_worker is not None
-            and not self._inference_busy
-        ):
-            self._inference_busy = True
-            self.inference_input.emit(frame)
+            if hasattr(main_win, "_update_controls_state"):
+                main_win._update_controls_state()
+        if self._pose_estimation_enabled and self._pose_worker is not None:
+            # 推論中なら最新の 1 枚だけがワーカー側に保持される
+            self._pose_worker.submit(frame)
+        # --- キャリブ中は一定枚数ごとに届いたばかりのフレームで検出する
+        # タイマーで _last_image を読む方式と違い、同じフレームの再検出や取りこぼしが無い
+        # 前回の検出がまだ終わっていなければ、そのフレームは見送る
+        if self.calibrating:
+            self._frame_count += 1
+            if (
+                self._frame_count % CALIB_CAPTURE_FRAME_STRIDE == 0
+                and not self._calib_detecting
+            ):
+                self._capture_calib_frame(frame)
+        self._schedule_render()
 
 
-    def _on_pose_result(self, landmarks: list) -> None:
-        """姿勢推定結果を受け取り保存する。"""
-        self._last_landmarks = landmarks
-        self._inference_busy = False
+    @Slot(object)
+    def _on_pose_result(self, overlay: PoseOverlay) -> None:
+        """描画済みの姿勢推定結果を受け取り保存する。"""
+        self._pose_overlay = overlay
 
 
     @property
     def latest_frame(self) -> np.ndarray | None:
-        """直近フレーム（ステレオキャリブレーション用に公開）"""
+        """直近フレーム（ステレオキャリブレーション用に公開）
+
+        キャプチャスレッドが送出した読み取り専用の配列をコピーせずに返す。
+        書き換えが必要な場合は呼び出し側でコピーすること。
+        """
         return self._last_image
 
 
     def _on_exposure_changed(self, value: int) -> None:
-        """露出スライダー変更時にカメラへ反映し設定を保存する。"""
+        """露出スライダー変更時にカメラへ反映し、設定の保存を予約する。"""
         self.camera_stream_manager.set_exposure(self.device_id, float(value))
-        self._save_settings()
+        self._save_timer.start()
 
 
     def _on_brightness_changed(self, value: int) -> None:
-        """明るさスライダー変更時にカメラへ反映し設定を保存する。"""
+        """明るさスライダー変更時にカメラへ反映し、設定の保存を予約する。"""
         self.camera_stream_manager.set_brightness(self.device_id, float(value))
-        self._save_settings()
+        self._save_timer.start()
 
 
     def _save_settings(self) -> None:
-        """現在の露出と明るさ補正をデバイスごとに保存する。"""
-        settings_path = _settings_file_path(self.device_id)
-        lock_path = settings_path + ".lock"
-        data = {
+        """現在の露出と明るさ補正のデバイスごとの保存を予約する（書き込みは別スレッド）。"""
+        self._settings_writer.request_save({
             "exposure": int(self.exposure_slider.value()),
             "brightness": int(self.brightness_slider.value()),
-        }
-        try:
-            with FileLock(lock_path):
-                with open(settings_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f)
-        except Exception as e:
-            logger.error("カメラ設定保存失敗: %s", e)
+        })
 
 
     def _on_calib_toggle(self, checked: bool) -> None:
@@ -361,62 +579,86 @@ class CameraPreviewWindow(QDialog):
             self.calibrating = True
             self._frame_count = 0
             self.calibrator = CameraCalibrator()
-            self._calib_timer.start()
         else:
             self._stop_calibration(cancel=True)
 
 
-    def _on_calib_frame_timer(self) -> None:
-        """定期的にキャリブレーション用フレームを取得する。"""
-        if not self.calibrating or self._last_image is None:
+    def _capture_calib_frame(self, frame: np.ndarray) -> None:
+        """フレームのチェスボード検出をスレッドプールで開始する。"""
+        calibrator = self.calibrator
+        self._calib_detecting = True
+        add_chessboard_image_async(
+            calibrator,
+            frame,
+            on_done=lambda result: self._on_calib_detected(calibrator, frame, result),
+        )
+
+
+    def _on_calib_detected(
+        self, calibrator: CameraCalibrator, frame: np.ndarray, result: bool | Exception
+    ) -> None:
+        """チェスボード検出の結果を反映し、揃えばキャリブレーションを開始する。"""
+        self._calib_detecting = False
+        # 検出中にキャリブを停止・やり直していれば、古い結果は反映しない
+        if not self.calibrating or calibrator is not self.calibrator:
+            return
+        if isinstance(result, Exception):
+            logger.error("チェスボード検出失敗: %s", result)
             return
-        # --- チェスボード検出
-        found = self.calibrator.add_chessboard_image(self._last_image)
-        self._frame_count += 1
-        if found:
-            self.progress_bar.setValue(len(self.calibrator.image_points))
+        if result:
+            self.progress_bar.setValue(len(calibrator.image_points))
 
         # --- 十分な枚数集まったらキャリブレーション実行
-        if len(self.calibrator.image_points) >= CALIB_IMAGES_REQUIRED:
-            try:
-                self.calibrator.calibrate(self._last_image.shape[:2])
-                self.calibration_done = True
-                err = self.calibrator.reprojection_error
-                self.status_label.setStyleSheet(f"color: {TEXT_COLOR};")
-                if err is not None:
-                    self.status_label.setText(f"再投影誤差: {err:.3f}")
-                else:
-                    self.status_label.setText("再投影誤差: 計算不可")
-
-                # --- プロジェクトルート直下のdata/に保存
-                calib_path = _calib_file_path(self.device_id)
-                self.calibrator.save(calib_path)
-                logger.info("キャリブレーションパラメータを保存: %s", calib_path)
-            except Exception as e:
-                self.status_label.setStyleSheet(f"color: {WARNING_COLOR};")
-                self.status_label.setText(f"キャリブレーション失敗: {str(e)}")
-            self._stop_calibration(cancel=False)
+        # calibrateCamera と保存はスレッドプールで行い、GUI スレッドを止めない
+        if len(calibrator.image_points) >= CALIB_IMAGES_REQUIRED:
+            self.calibrating = False
+            self._calib_computing = True
+            self.calib_button.setEnabled(False)
+            self.status_label.setStyleSheet(f"color: {SUBTEXT_COLOR};")
+            self.status_label.setText("キャリブレーション計算中...")
+            calib_path = _calib_file_path(self.device_id)
+            calibrate_and_save_async(
+                calibrator,
+                frame.shape[:2],
+                calib_path,
+                on_done=lambda result: self._on_calibrated(calibrator, calib_path, result),
+            )
+
+
+    def _on_calibrated(
+        self, calibrator: CameraCalibrator, calib_path: str, result: float | Exception
+    ) -> None:
+        """バックグラウンドのキャリブレーション完了時に結果を反映する。"""
+        self._calib_computing = False
+        self.calib_button.setEnabled(not self._pose_estimation_enabled)
+        # 計算中にキャリブレーションをやり直していれば、古い結果は反映しない
+        if calibrator is not self.calibrator:
+            return
+        if isinstance(result, Exception):
+            self.status_label.setStyleSheet(f"color: {WARNING_COLOR};")
+            self.status_label.setText(f"キャリブレーション失敗: {str(result)}")
+        else:
+            self.calibration_done = True
+            logger.info("キャリブレーションパラメータを保存: %s", calib_path)
+        self._stop_calibration(cancel=False)
 
 
     def _stop_calibration(self, cancel: bool = False) -> None:
         """キャリブレーション処理を停止し UI をリセットする。"""
         self.calibrating = False
-        self._calib_timer.stop()
         self.calib_button.setChecked(False)
         self.calib_button.setText("キャリブレーション開始")
         if cancel:
             # --- 既存のキャリブレーション結果があれば再読み込み
-            calib_path = _calib_file_path(self.device_id)
-            if os.path.exists(calib_path):
-                try:
-                    self.calibrator.load(calib_path)
-                    self.calibration_done = True
-                    self.progress_bar.setValue(self.progress_bar.maximum())
-                except Exception as e:
-                    logger.error("キャリブレーションパラメータ読み込み失敗: %s", e)
-                    self.calibration_done = False
-                    self.progress_bar.setValue(0)
-            else:
+            try:
+                self.calibrator.load(_calib_file_path(self.device_id))
+                self.calibration_done = True
+                self.progress_bar.setValue(self.progress_bar.maximum())
+            except FileNotFoundError:
+                self.calibration_done = False
+                self.progress_bar.setValue(0)
+            except Exception as e:
+                logger.error("キャリブレーションパラメータ読み込み失敗: %s", e)
                 self.calibration_done = False
                 self.progress_bar.setValue(0)
         else:
@@ -424,10 +666,8 @@ class CameraPreviewWindow(QDialog):
         self._update_status_label()
         # キャリブ状態が変わったので、MainWindow のグローバル推定ボタンを更新
         main_win = self.parent()
-        if hasattr(main_win, "_update_global_est_button_state"):
-            main_win._update_global_est_button_state()
-        if hasattr(main_win, "_update_stereo_button_state"):
-            main_win._update_stereo_button_state()
+        if hasattr(main_win, "_update_controls_state"):
+            main_win._update_controls_state()
 
 
     def _update_status_label(self) -> None:
@@ -451,12 +691,14 @@ class CameraPreviewWindow(QDialog):
                 self._pose_worker = PoseEstimationWorker()
                 self._pose_thread = QThread(self)
                 self._pose_worker.moveToThread(self._pose_thread)
-                self._pose_worker.result_ready.connect(self._on_pose_result)
-                self.inference_input.connect(self._pose_worker.process_frame)
+                # 発行元は推論スレッドなので、常にキュー経由で GUI スレッドへ渡す
+                self._pose_worker.result_ready.connect(
+                    self._on_pose_result, Qt.ConnectionType.QueuedConnection
+                )
                 self._pose_thread.start()
         elif not enabled and self._pose_estimation_enabled:
             if self._pose_worker is not None and self._pose_thread is not None:
-                self.inference_input.disconnect(self._pose_worker.process_frame)
+                self._pose_worker.stop()
                 self._pose_worker.result_ready.disconnect(self._on_pose_result)
                 self._pose_thread.quit()
                 self._pose_thread.wait()
@@ -465,11 +707,49 @@ class CameraPreviewWindow(QDialog):
                 self._pose_thread.deleteLater()
                 self._pose_worker = None
                 self._pose_thread = None
-                self._last_landmarks = None
-                self._inference_busy = False
+                self._pose_overlay = None
         self._pose_estimation_enabled = enabled
         # 姿勢推定中は内部キャリブボタンを無効化
-        self.calib_button.setEnabled(not enabled)
+        self.calib_button.setEnabled(not enabled and not self._calib_computing)
+
+
+    def suspend(self) -> None:
+        """カメラ停止時にウィンドウを破棄せずに隠す（再起動時は :meth:`resume` で再表示）。
+
+        ウィジェットやバッファ、キャリブレーション結果は保持したまま、
+        ストリームを止めて保留中の設定を保存する。
+        """
+        if self.calibrating:
+            self._stop_calibration(cancel=True)
+        self._release_stream()
+        # 停止中のカメラがステレオ校正などの対象にならないよう、古いフレームは捨てる
+        self._last_image = None
+        self._first_frame_received = False
+        self._suspended = True
+        self.hide()
+
+
+    def resume(self) -> None:
+        """:meth:`suspend` したウィンドウを再表示し、新しいストリームへ設定を送り直す。"""
+        self._suspended = False
+        self.camera_stream_manager.set_exposure(
+            self.device_id, float(self.exposure_slider.value())
+        )
+        self.camera_stream_manager.set_brightness(
+            self.device_id, float(self.brightness_slider.value())
+        )
+        self.show()
+
+
+    def _release_stream(self) -> None:
+        """推定と描画を止めてストリームを停止し、保留中の設定を保存する。"""
+        self.set_pose_estimation_enabled(False)
+        self._render_timer.stop()
+        self.camera_stream_manager.stop_camera(self.device_id)
+        # 保留中の保存はここでまとめて行う
+        self._save_timer.stop()
+        self._save_settings()
+        self._settings_writer.flush()
 
 
     def force_close(self) -> None:
@@ -491,12 +771,11 @@ class CameraPreviewWindow(QDialog):
             )
             event.ignore()
             return
-        self.set_pose_estimation_enabled(False)
         self._force_close = False
-        self.camera_stream_manager.q_image_ready.disconnect(self._on_image_ready_slot)
         self.camera_stream_manager.frame_ready.disconnect(self._on_frame_ready)
-        self.camera_stream_manager.stop_camera(self.device_id)
-        self._save_settings()
+        # suspend 済みならストリームの停止と保存は済んでいる
+        if not self._suspended:
+            self._release_stream()
         if self._on_closed:
             self._on_closed(self.device_id)
         super().closeEvent(event)
@@ -0,0 +1,180 @@
+# estv/gui/camera_table_model.py
+"""メインウィンドウのカメラ一覧テーブル用モデル。"""
+
+from collections.abc import Iterable
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+)
+from PySide6.QtGui import QColor
+
+from estv.gui.style_constants import (
+    SUCCESS_COLOR,
+    WARNING_COLOR,
+)
+
+
+# --- 列番号
+COLUMN_ID = 0
+COLUMN_NAME = 1
+COLUMN_STATUS = 2
+COLUMN_ACTION = 3   # 操作ボタン（ビュー側で setIndexWidget する）
+
+_HEADERS = ("ID", "名前", "状態", "操作")
+
+# --- 状態セルの表示文字列
+_STATUS_STOPPED = "停止中"
+_STATUS_RUNNING = "起動中"
+_STATUS_ESTIMATING = "推定中"
+
+_Index = QModelIndex | QPersistentModelIndex
+
+
+class CameraTableModel(QAbstractTableModel):
+    """カメラデバイス一覧と起動状態を保持するテーブルモデル。
+
+    デバイス一覧の変化は増減した行の挿入・削除として通知し、残った行
+    （ビューに載せた操作ボタンを含む）はそのまま使い回す。起動状態の変化では
+    状態が変わった行の「状態」セルだけを ``dataChanged`` で通知する。
+    """
+
+    # --- 状態セルの文字色（全インスタンス・全 data() 呼び出しで共有する）
+    _SUCCESS_QCOLOR = QColor(SUCCESS_COLOR)
+    _WARNING_QCOLOR = QColor(WARNING_COLOR)
+
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        # 行ごとの (カメラID, 表示名)。表示用の文字列はデバイス一覧の更新時に 1 回だけ作る
+        self._rows: list[tuple[str, str]] = []
+        # ID 列に表示する行番号の文字列（行数の最大値まで伸ばして使い回す）
+        self._row_labels: list[str] = []
+        self._running: frozenset[str] = frozenset()
+        self._estimating: bool = False
+
+
+    def set_camera_infos(self, infos: list[dict[str, str]]) -> None:
+        """デバイス一覧を差し替え、増減した行だけを挿入・削除する。"""
+        rows = [
+            (info.get("id", str(row)), info.get("name", f"Camera {row}"))
+            for row, info in enumerate(infos)
+        ]
+        for row in range(len(self._row_labels), len(rows)):
+            self._row_labels.append(str(row))
+        old_ids = [camera_id for camera_id, _ in self._rows]
+        new_ids = [camera_id for camera_id, _ in rows]
+        old_set, new_set = set(old_ids), set(new_ids)
+        # --- 残る行の並び順が変わった場合は差分で表せないので作り直す
+        if [c for c in old_ids if c in new_set] != [c for c in new_ids if c in old_set]:
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+            return
+        # --- 消えた行を後ろから削除し、増えた行を新しい位置へ挿入する
+        for row in reversed(range(len(old_ids))):
+            if old_ids[row] not in new_set:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self.endRemoveRows()
+        for row, camera_id in enumerate(new_ids):
+            if camera_id not in old_set:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._rows.insert(row, rows[row])
+                self.endInsertRows()
+        # --- 残った行も名前や行番号（ID 列）が変わりうるため表示を更新する
+        self._rows = rows
+        if rows:
+            self.dataChanged.emit(
+                self.index(0, COLUMN_ID),
+                self.index(len(rows) - 1, COLUMN_NAME),
+                [Qt.ItemDataRole.DisplayRole],
+            )
+
+
+    def set_running(self, running_ids: Iterable[str], estimating: bool) -> None:
+        """起動中のカメラIDと推定状態を更新し、表示が変わる行だけを通知する。"""
+        running = frozenset(running_ids)
+        old_running, old_estimating = self._running, self._estimating
+        self._running, self._estimating = running, estimating
+        if estimating != old_estimating:
+            # 「推定中」表示は起動中の全行に関わる
+            changed = old_running | running
+        else:
+            changed = old_running ^ running
+        for row, (camera_id, _) in enumerate(self._rows):
+            if camera_id in changed:
+                index = self.index(row, COLUMN_STATUS)
+                self.dataChanged.emit(
+                    index, index,
+                    [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ForegroundRole],
+                )
+
+
+    def camera_id(self, row: int) -> str:
+        """``row`` 行目のカメラIDを返す。"""
+        return self._rows[row][0]
+
+
+    def camera_name(self, row: int) -> str:
+        """``row`` 行目のカメラ名を返す。"""
+        return self._rows[row][1]
+
+
+    def is_running(self, row: int) -> bool:
+        """``row`` 行目のカメラが起動中かどうか。"""
+        return self.camera_id(row) in self._running
+
+
+    def rowCount(self, parent: _Index = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+
+    def columnCount(self, parent: _Index = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(_HEADERS)
+
+
+    def data(self, index: _Index, role: int = Qt.ItemDataRole.DisplayRole) -> object:
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COLUMN_ID:
+                return self._row_labels[row]
+            if column == COLUMN_NAME:
+                return self.camera_name(row)
+            if column == COLUMN_STATUS:
+                if not self.is_running(row):
+                    return _STATUS_STOPPED
+                return _STATUS_ESTIMATING if self._estimating else _STATUS_RUNNING
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if column in (COLUMN_ID, COLUMN_STATUS):
+                return Qt.AlignmentFlag.AlignCenter
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            if column == COLUMN_STATUS:
+                return self._SUCCESS_QCOLOR if self.is_running(row) else self._WARNING_QCOLOR
+        return None
+
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> object:
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+            and 0 <= section < len(_HEADERS)
+        ):
+            return _HEADERS[section]
+        return None
+
+
+    def flags(self, index: _Index) -> Qt.ItemFlag:
+        # 操作列はボタンを載せるだけなので、セル自体は操作対象にしない
+        if not index.isValid() or index.column() == COLUMN_ACTION:
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled
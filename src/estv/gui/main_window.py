@@ -1,18 +1,14 @@
 # estv/gui/main_window.py
 
-import re
+from functools import lru_cache, partial
 from pathlib import Path
 
-import cv2
 import numpy as np
 from PySide6.QtCore import (
     Qt,
     QTimer,
 )
-from PySide6.QtGui import (
-    QCloseEvent,
-    QColor,
-)
+from PySide6.QtGui import QCloseEvent
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QDialog,
@@ -21,30 +17,42 @@ from PySide6.QtWidgets import (
     QMainWindow,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from estv.devices.camera_stream_manager import CameraStreamManager
 from estv.devices.media_device_manager import MediaDeviceManager
-from estv.devices.stereo_calibrator import StereoParams, stereo_calibrate
+from estv.devices.stereo_calibrator import (
+    StereoParams,
+    stereo_calibrate_from_images_async,
+)
 from estv.gui.camera_preview_window import (
     CameraPreviewWindow,
     _calib_file_path,
     _get_data_dir,
+    _safe_device_id,
 )
-from estv.gui.style_constants import (
-    SUCCESS_COLOR,
-    WARNING_COLOR,
+from estv.gui.camera_table_model import (
+    COLUMN_ACTION,
+    CameraTableModel,
 )
 
 
+# --- 行ごとの起動/停止ボタンのスタイル（ボタン生成のたびに文字列を組み立てない）
+_CAMERA_BUTTON_STYLE = "padding: 4px 12px; margin: 4px;"
+
+
+@lru_cache(maxsize=64)
 def _stereo_file_path(cam1_id: str, cam2_id: str) -> str:
-    """IDペアから外部キャリブファイルパスを生成する。"""
-    safe1 = re.sub(r"[^A-Za-z0-9._-]", "_", cam1_id)
-    safe2 = re.sub(r"[^A-Za-z0-9._-]", "_", cam2_id)
+    """IDペアから外部キャリブファイルパスを生成する。
+
+    ID の置換には事前コンパイル済みの正規表現を使う ``_safe_device_id`` を共有し、
+    カメラの組み合わせは固定なので結果もペアごとに使い回す。
+    """
+    safe1 = _safe_device_id(cam1_id)
+    safe2 = _safe_device_id(cam2_id)
     if safe1 > safe2:
         safe1, safe2 = safe2, safe1
     return str(_get_data_dir() / f"stereo_{safe1}_{safe2}.npz")
@@ -67,11 +75,33 @@ class MainWindow(QMainWindow):
         )
 
         self._camera_device_infos: list[dict[str, str]] = []
+        # カメラIDごとの起動/停止ボタン（一覧に残るカメラのボタンは使い回す）
+        self._camera_buttons: dict[str, QPushButton] = {}
+        # 直前にテーブルへ反映した (起動中ID, 推定中か)（変化が無ければ更新を省く）
+        self._last_refresh_key: tuple[frozenset[str], bool] | None = None
         self._preview_windows: dict[str, CameraPreviewWindow] = {}
+        # カメラ停止で隠したプレビュー（再起動時に作り直さず再表示する）
+        self._hidden_previews: dict[str, CameraPreviewWindow] = {}
         self._stereo_params: StereoParams | None = None
+        # ステレオ校正ファイルのパスごとの (更新時刻 ns, 読み込み結果)
+        # ボタン状態の更新は頻繁に呼ばれるため、ファイルが変わったときだけ読み直す
+        self._stereo_cache: dict[str, tuple[int, StereoParams]] = {}
+        self._stereo_calibrating: bool = False  # ステレオ校正をバックグラウンド実行中か
 
         self._estimation_active: bool = False
 
+        # --- テーブル更新をイベントループ 1 周につき 1 回にまとめるタイマー
+        # 起動・停止やデバイス一覧の通知が続けて届いても、反映は最後の状態で 1 回だけ行う
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self._do_refresh_camera_table)
+        # --- 推定・ステレオ・起動ボタンの状態更新も同様に 1 回へまとめる
+        self._controls_timer = QTimer(self)
+        self._controls_timer.setSingleShot(True)
+        self._controls_timer.setInterval(0)
+        self._controls_timer.timeout.connect(self._do_update_controls_state)
+
         self.setWindowTitle("ESTV - ESTiVision-MP")
         self._setup_ui()
 
@@ -85,27 +115,28 @@ class MainWindow(QMainWindow):
         devices_group = QGroupBox("Devices")
         devices_layout = QVBoxLayout()
 
-        self.camera_table = QTableWidget()
-        self.camera_table.setColumnCount(4)
-        self.camera_table.setHorizontalHeaderLabels(["ID", "名前", "状態", "操作"])
+        self._camera_table_model = CameraTableModel(self)
+        self.camera_table = QTableView()
+        self.camera_table.setModel(self._camera_table_model)
         self.camera_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.camera_table.setSelectionMode(QAbstractItemView.NoSelection)
         self.camera_table.horizontalHeader().setStretchLastSection(True)
         self.camera_table.verticalHeader().setVisible(False)
+        self.camera_table.verticalHeader().setDefaultSectionSize(32)
         self.camera_table.setColumnWidth(0, 40)
         self.camera_table.setColumnWidth(1, 240)
         self.camera_table.setColumnWidth(2, 60)
         self.camera_table.setColumnWidth(3, 120)
         self.camera_table.setFixedSize(480, 200)
         self.camera_table.setStyleSheet("""
-            QTableWidget::item {
+            QTableView::item {
                 background: transparent;
             }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background: transparent;
                 color: auto;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background: transparent;
                 color: auto;
             }
@@ -155,50 +186,68 @@ class MainWindow(QMainWindow):
     def _on_camera_devices_update(self, camera_device_infos: list[dict[str, str]]) -> None:
         """利用可能なカメラデバイス一覧の更新を処理する。"""
         self._camera_device_infos = camera_device_infos
+        model = self._camera_table_model
+        # --- 行の挿入・削除とボタンの設置が済むまで描画を止め、最後に 1 回だけ描き直す
+        # （並べ替えは無効のままなので sortingEnabled の切り替えは不要。
+        #   モデルのシグナルはビューの更新に必要なため blockSignals はしない）
+        self.camera_table.setUpdatesEnabled(False)
+        try:
+            model.set_camera_infos(camera_device_infos)
+            # --- 操作ボタンは新しく増えた行にだけ作る
+            # 消えた行のボタンはビューが行と一緒に破棄する
+            buttons: dict[str, QPushButton] = {}
+            created = False
+            for row in range(model.rowCount()):
+                camera_id = model.camera_id(row)
+                index = model.index(row, COLUMN_ACTION)
+                btn = self.camera_table.indexWidget(index)
+                if btn is None:
+                    btn = self._create_camera_button(camera_id)
+                    self.camera_table.setIndexWidget(index, btn)
+                    created = True
+                buttons[camera_id] = btn
+            self._camera_buttons = buttons
+        finally:
+            self.camera_table.setUpdatesEnabled(True)
+        # 新しいボタンは未設定なので、起動状態が同じでも必ず反映し直す
+        if created:
+            self._last_refresh_key = None
         self._refresh_camera_table()
 
 
+    def _create_camera_button(self, camera_id: str) -> QPushButton:
+        """カメラ 1 台分の起動/停止トグルボタンを生成する。"""
+        btn = QPushButton()
+        btn.setCheckable(True)
+        btn.setMinimumWidth(60)
+        btn.setStyleSheet(_CAMERA_BUTTON_STYLE)
+        # partial は引数の数を推定できないため、bool 版のシグナルを明示して checked を渡す
+        btn.clicked[bool].connect(partial(self._toggle_camera, camera_id))
+        return btn
+
+
     def _refresh_camera_table(self) -> None:
-        """カメラ状態テーブルを再描画する。"""
-        running_ids = set(self._camera_stream_manager.running_device_ids())
-        row_count = len(self._camera_device_infos)
-        self.camera_table.setRowCount(row_count)
-
-        for row, info in enumerate(self._camera_device_infos):
-            camera_id = info.get("id", str(row))
-            name = info.get("name", f"Camera {row}")
-            running = camera_id in running_ids
+        """テーブルの更新を予約する（連続した要求は 1 回にまとめる）。"""
+        self._refresh_timer.start()
+
 
-            # --- ID
-            id_item = QTableWidgetItem(str(row))
-            id_item.setTextAlignment(Qt.AlignCenter)
-            self.camera_table.setItem(row, 0, id_item)
-
-            # --- 名前
-            name_item = QTableWidgetItem(name)
-            self.camera_table.setItem(row, 1, name_item)
-
-            # --- 状態
-            status_item = QTableWidgetItem("推定中" if self._estimation_active and running else ("起動中" if running else "停止中"))
-            status_item.setTextAlignment(Qt.AlignCenter)
-            color = QColor(SUCCESS_COLOR) if running else QColor(WARNING_COLOR)
-            status_item.setForeground(color)
-            self.camera_table.setItem(row, 2, status_item)
-
-            # --- 操作ボタン
-            btn = QPushButton("停止" if running else "起動")
-            btn.setCheckable(True)
+    def _do_refresh_camera_table(self) -> None:
+        """カメラの起動状態をテーブルへ反映する（セルやボタンは作り直さない）。"""
+        running_ids = frozenset(self._camera_stream_manager.running_device_ids())
+        key = (running_ids, self._estimation_active)
+        if key == self._last_refresh_key:
+            return
+        self._last_refresh_key = key
+        self._camera_table_model.set_running(running_ids, self._estimation_active)
+
+        # --- 操作ボタン
+        for camera_id, btn in self._camera_buttons.items():
+            running = camera_id in running_ids
+            btn.setText("停止" if running else "起動")
             btn.setChecked(running)
-            btn.setMinimumWidth(60)
-            btn.setStyleSheet("padding: 4px 12px; margin: 4px;")
-            if self._estimation_active:
-                btn.setEnabled(False)
-            btn.clicked.connect(lambda checked, cid=camera_id: self._toggle_camera(cid, checked))
-            self.camera_table.setCellWidget(row, 3, btn)
-            self.camera_table.setRowHeight(row, 32)
 
-            self._update_stereo_button_state()
-            self._update_start_buttons_state()
+        # 全ボタン・全プレビューを走査するため、行ごとではなく最後に 1 回だけ予約する
+        self._update_controls_state()
 
 
     def _toggle_camera(self, device_id: str, checked: bool) -> None:
@@ -208,8 +257,12 @@ class MainWindow(QMainWindow):
             return  # 起動要求を無視
         if checked:
             self._camera_stream_manager.start_camera(device_id)
-            # --- プレビューウィンドウを開く
-            if device_id not in self._preview_windows:
+            # --- プレビューウィンドウを開く（停止時に隠したものがあれば再表示する）
+            if device_id in self._hidden_previews:
+                preview = self._hidden_previews.pop(device_id)
+                self._preview_windows[device_id] = preview
+                preview.resume()
+            elif device_id not in self._preview_windows:
                 device_name = next(
                     (
                         info.get("name", device_id)
@@ -228,90 +281,112 @@ class MainWindow(QMainWindow):
                 preview.show()
                 self._preview_windows[device_id] = preview
         else:
-            # --- プレビューウィンドウを閉じる
-            if device_id in self._preview_windows:
-                self._preview_windows[device_id].close()
+            # --- プレビューウィンドウは閉じずに隠し、再起動時に使い回す
+            preview = self._preview_windows.pop(device_id, None)
+            if preview is not None:
+                preview.suspend()
+                self._hidden_previews[device_id] = preview
             else:
                 self._camera_stream_manager.stop_camera(device_id)
-        self._update_global_est_button_state()
+        self._update_controls_state()
+
+
+    def _update_controls_state(self) -> None:
+        """推定・ステレオ・起動ボタンの状態更新を予約する（連続した要求は 1 回にまとめる）。
+
+        プレビューウィンドウからもキャリブ状態や最初のフレームの変化時に呼ばれる。
+        """
+        self._controls_timer.start()
 
 
-    def _update_global_est_button_state(self) -> None:
-        """キャリブ済みプレビューが1つでもあればボタンを有効化。"""
-        has_ready = any(p.calibration_done for p in self._preview_windows.values())
-        self.global_est_button.setEnabled(has_ready)
+    def _do_update_controls_state(self) -> None:
+        """プレビュー一覧を 1 回だけ走査し、各ボタンの状態をまとめて更新する。"""
+        calibrated = [p for p in self._preview_windows.values() if p.calibration_done]
+        # キャリブ済みプレビューが1つでもあれば推定ボタンを有効化
+        self.global_est_button.setEnabled(bool(calibrated))
+        self._apply_stereo_button_state([p for p in calibrated if p.latest_frame is not None])
+        self._apply_start_buttons_state()
 
 
     def _toggle_global_estimation(self, checked: bool) -> None:
         """起動済み＆キャリブレーション済みカメラの推定を一括 ON/OFF"""
         self._estimation_active = checked
+        any_calibrated = False
         for preview in self._preview_windows.values():
             if preview.calibration_done: # キャリブ済みのみ対象
                 preview.set_pose_estimation_enabled(checked)
+                any_calibrated = True
 
         # --- ボタン表示を更新
         self.global_est_button.setText("姿勢推定停止" if checked else "姿勢推定開始")
-        self._refresh_camera_table()
+        # 対象のプレビューが無ければカメラの状態は変わらないため、テーブル更新は省く
+        # （推定フラグの変化は次回の更新でまとめて反映される）
+        if any_calibrated:
+            self._refresh_camera_table()
 
         # --- 推定中は新規カメラ起動を禁止
         self._launch_enabled = not checked
-        self._update_start_buttons_state()
+        self._update_controls_state()
 
 
-    def _update_start_buttons_state(self) -> None:
+    def _apply_start_buttons_state(self) -> None:
         """行ごとの '起動／停止' ボタンの有効・無効を更新する。"""
-        rows = self.camera_table.rowCount()
-        running_count = len(self._camera_stream_manager.running_device_ids())
-        max_streams = self._camera_stream_manager.max_streams
-        for row in range(rows):
-            btn = self.camera_table.cellWidget(row, 3)
-            if btn is None:
-                continue
-            running = btn.isChecked()
-            if not self._launch_enabled:
-                btn.setEnabled(False)
-            elif not running and running_count >= max_streams:
-                btn.setEnabled(False)
-            else:
-                btn.setEnabled(True)
+        # 起動数と上限はループの外で一度だけ取得し、各ボタンは自身の状態だけを見る
+        launch_enabled = self._launch_enabled
+        has_free_slot = (
+            len(self._camera_stream_manager.running_device_ids())
+            < self._camera_stream_manager.max_streams
+        )
+        for btn in self._camera_buttons.values():
+            # 推定中はすべて無効、それ以外は起動中（停止可能）か空きがあれば有効
+            btn.setEnabled(launch_enabled and (btn.isChecked() or has_free_slot))
 
 
     def _on_preview_closed(self, device_id: str) -> None:
         """プレビューウィンドウが閉じられた際の後処理。"""
-        if device_id in self._preview_windows:
-            del self._preview_windows[device_id]
-        self._update_stereo_button_state()
-        self._update_global_est_button_state()
-
-
-    def _update_stereo_button_state(self) -> None:
-        """内部キャリブ済み & 起動中カメラが 2 台以上ならボタンを有効化."""
-        ready = [
-            p
-            for p in self._preview_windows.values()
-            if p.calibration_done and p.latest_frame is not None
-        ]
-        self.stereo_calib_button.setEnabled(len(ready) >= 2)
+        self._preview_windows.pop(device_id, None)
+        self._hidden_previews.pop(device_id, None)
+        self._update_controls_state()
+
+
+    def _apply_stereo_button_state(self, ready: list[CameraPreviewWindow]) -> None:
+        """内部キャリブ済み & 起動中カメラ ``ready`` が 2 台以上ならボタンを有効化."""
+        self.stereo_calib_button.setEnabled(len(ready) >= 2 and not self._stereo_calibrating)
         if len(ready) >= 2:
             cam1, cam2 = ready[:2]
             path = Path(_stereo_file_path(cam1.device_id, cam2.device_id))
-            if path.exists():
-                try:
-                    self._stereo_params = StereoParams.load(path)
-                    self.stereo_status_label.setText(
-                        f"再投影誤差: {self._stereo_params.rms:.3f}"
-                    )
-                except Exception:  # pylint: disable=broad-except
-                    self._stereo_params = None
-                    self.stereo_status_label.setText("未キャリブレーション")
+            self._stereo_params = self._load_stereo_params(path)
+            if self._stereo_params is not None:
+                self.stereo_status_label.setText(
+                    f"再投影誤差: {self._stereo_params.rms:.3f}"
+                )
             else:
-                self._stereo_params = None
                 self.stereo_status_label.setText("未キャリブレーション")
         else:
             self._stereo_params = None
             self.stereo_status_label.setText("未キャリブレーション")
 
 
+    def _load_stereo_params(self, path: Path) -> StereoParams | None:
+        """ステレオ校正ファイルを読み込む（更新時刻が前回と同じならキャッシュを返す）。"""
+        key = str(path)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._stereo_cache.pop(key, None)
+            return None
+        cached = self._stereo_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            params = StereoParams.load(path)
+        except Exception:  # pylint: disable=broad-except
+            self._stereo_cache.pop(key, None)
+            return None
+        self._stereo_cache[key] = (mtime, params)
+        return params
+
+
     def _start_stereo_calibration(self) -> None:
         """5 秒カウント後に 2 台同時撮影し外部パラメータを推定."""
         # 対象カメラを固定（先頭 2 台）
@@ -355,55 +430,77 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "撮影失敗", "画像を取得できませんでした。")
             return
 
-        calib_path1 = Path(_calib_file_path(cam1.device_id))
-        calib_path2 = Path(_calib_file_path(cam2.device_id))
         stereo_path = Path(_stereo_file_path(cam1.device_id, cam2.device_id))
 
         try:
-            data1 = np.load(str(calib_path1))
-            data2 = np.load(str(calib_path2))
-            k1, d1 = data1["camera_matrix"], data1["dist_coeffs"]
-            k2, d2 = data2["camera_matrix"], data2["dist_coeffs"]
+            k1, d1 = self._camera_intrinsics(cam1)
+            k2, d2 = self._camera_intrinsics(cam2)
 
             board_size = (6, 9)
             square_size_m = 0.02
 
-            gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-            gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
-            found1, corners1 = cv2.findChessboardCorners(gray1, board_size, None)
-            found2, corners2 = cv2.findChessboardCorners(gray2, board_size, None)
-            if not (found1 and found2):
-                raise ValueError("チェスボードが検出できませんでした。")
-
-            criteria = (
-                cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER,
-                30,
-                0.001,
-            )
-            corners1 = cv2.cornerSubPix(gray1, corners1, (11, 11), (-1, -1), criteria)
-            corners2 = cv2.cornerSubPix(gray2, corners2, (11, 11), (-1, -1), criteria)
-
-            image_size = (img1.shape[1], img1.shape[0])
-
-            params = stereo_calibrate(
-                [corners1],
-                [corners2],
+            # --- コーナー検出と校正計算はスレッドプールで行い、完了時に GUI スレッドで
+            #     結果を反映する（検出失敗も例外として _on_stereo_calibrated に届く）
+            # 2 台分の検出はワーカー内で専用の 2 スレッドに分けて並行に行う
+            stereo_calibrate_from_images_async(
+                img1,
+                img2,
                 board_size,
                 square_size_m,
                 k1,
                 d1,
                 k2,
                 d2,
-                image_size,
                 cam1.device_id,
                 cam2.device_id,
+                on_done=lambda result: self._on_stereo_calibrated(result, stereo_path),
             )
-            params.save(stereo_path)
-            self._stereo_params = params
+        except Exception as exc:  # pylint: disable=broad-except
+            QMessageBox.critical(
+                self,
+                "ステレオキャリブレーション失敗",
+                str(exc),
+            )
+            # ボタンを再び有効化
+            self._update_controls_state()
+            return
+
+        # --- 完了までボタンを無効化
+        self._stereo_calibrating = True
+        self.stereo_calib_button.setEnabled(False)
+
+
+    @staticmethod
+    def _camera_intrinsics(preview: CameraPreviewWindow) -> tuple[np.ndarray, np.ndarray]:
+        """プレビューのカメラ行列と歪み係数を返す。
+
+        プレビューが読み込み済み（または計算済み）の値をそのまま使い、
+        再キャリブレーション中などで手元に無いときだけ保存ファイルから読む。
+        """
+        calibrator = preview.calibrator
+        if calibrator.camera_matrix is not None and calibrator.dist_coeffs is not None:
+            return calibrator.camera_matrix, calibrator.dist_coeffs
+        # mmap_mode は .npz では効かないため指定しない（数百バイトの配列 2 つのみ）
+        with np.load(_calib_file_path(preview.device_id), allow_pickle=False) as data:
+            return data["camera_matrix"], data["dist_coeffs"]
+
+
+    def _on_stereo_calibrated(
+        self, result: StereoParams | Exception, stereo_path: Path
+    ) -> None:
+        """バックグラウンドのステレオ校正完了時に結果を保存・表示する。"""
+        self._stereo_calibrating = False
+        try:
+            if isinstance(result, Exception):
+                raise result
+            result.save(stereo_path)
+            self._stereo_params = result
+            # 保存した内容をそのままキャッシュし、直後の状態更新で読み直さない
+            self._stereo_cache[str(stereo_path)] = (stereo_path.stat().st_mtime_ns, result)
             QMessageBox.information(
                 self,
                 "ステレオキャリブレーション完了",
-                f"再投影誤差: {params.rms:.3f}",
+                f"再投影誤差: {result.rms:.3f}",
             )
         except Exception as exc:  # pylint: disable=broad-except
             QMessageBox.critical(
@@ -413,13 +510,14 @@ class MainWindow(QMainWindow):
             )
 
         # ボタンを再び有効化
-        self._update_stereo_button_state()
+        self._update_controls_state()
 
 
     def closeEvent(self, event: QCloseEvent) -> None:
         """ウィンドウを閉じる際にすべてのストリームを停止する。"""
-        for preview in list(self._preview_windows.values()):
+        for preview in [*self._preview_windows.values(), *self._hidden_previews.values()]:
             preview.force_close()
         self._preview_windows.clear()
+        self._hidden_previews.clear()
         self._camera_stream_manager.shutdown()
         super().closeEvent(event)
@@ -0,0 +1,87 @@
+# estv/trackers/kernels.py
+"""仮想トラッカー計算の数値カーネル。
+
+Numba がインストールされていれば 1 つの JIT コンパイル済みループで計算し、
+無ければ同じ結果を NumPy の配列演算で求める。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:     # Numba は任意依存（pip install numba）
+    njit = None
+
+
+def _virtual_trackers_numpy(
+    xyz: np.ndarray,
+    mid_left: np.ndarray,
+    mid_right: np.ndarray,
+    direct: np.ndarray,
+    out: np.ndarray,
+    valid: np.ndarray,
+) -> int:
+    """``_virtual_trackers_loop`` と同じ計算を NumPy の配列演算で行う（Numba 無し用）。"""
+    n_mid = len(mid_left)
+    # --- 中点は左右どちらかが NaN なら NaN になるため、欠損判定は結果の行で行える
+    np.add(xyz[mid_left], xyz[mid_right], out=out[:n_mid])
+    out[:n_mid] *= 0.5
+    np.take(xyz, direct, axis=0, out=out[n_mid:])
+    np.any(np.isnan(out), axis=1, out=valid)
+    np.logical_not(valid, out=valid)
+    return int(np.count_nonzero(valid))
+
+
+def _virtual_trackers_loop(xyz, mid_left, mid_right, direct, out, valid):
+    """部位順の座標 ``xyz`` から仮想トラッカーの位置を ``out`` に書き込む。
+
+    ``out`` の先頭には ``mid_left`` / ``mid_right`` の中点、続いて ``direct`` の
+    ランドマークをそのまま並べる。``valid`` には各行が欠損（NaN）を含まないかを
+    書き込み、有効な行数を返す。NaN 判定を使うため fastmath は指定しない。
+    """
+    n_mid = mid_left.shape[0]
+    count = 0
+    for i in range(n_mid):
+        left = mid_left[i]
+        right = mid_right[i]
+        ok = True
+        for axis in range(3):
+            v = 0.5 * (xyz[left, axis] + xyz[right, axis])
+            out[i, axis] = v
+            if np.isnan(v):
+                ok = False
+        valid[i] = ok
+        if ok:
+            count += 1
+    for j in range(direct.shape[0]):
+        idx = direct[j]
+        ok = True
+        for axis in range(3):
+            v = xyz[idx, axis]
+            out[n_mid + j, axis] = v
+            if np.isnan(v):
+                ok = False
+        valid[n_mid + j] = ok
+        if ok:
+            count += 1
+    return count
+
+
+# --- 公開するカーネル（Numba があれば JIT 版、無ければ NumPy 版）
+if njit is not None:
+    virtual_trackers = njit(cache=True)(_virtual_trackers_loop)
+else:
+    virtual_trackers = _virtual_trackers_numpy
+
+
+def warm_up() -> None:
+    """JIT 版を使う場合、連続配列と構造化配列のビューの両方で事前にコンパイルする。"""
+    if njit is None:
+        return
+    idx = np.zeros(1, dtype=np.int64)
+    out = np.empty((2, 3), dtype=np.float32)
+    valid = np.empty(2, dtype=np.bool_)
+    contiguous = np.zeros((1, 3), dtype=np.float32)
+    strided = np.zeros((1, 4), dtype=np.float32)[:, :3]
+    for xyz in (contiguous, strided):
+        virtual_trackers(xyz, idx, idx, idx, out, valid)
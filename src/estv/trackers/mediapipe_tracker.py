@@ -1,42 +1,123 @@
 import numpy as np
 
-from estv.estimators.pose_estimator import PoseLandmark
-from estv.trackers.tracker_base import BaseTracker, VirtualTrackerResult
+from estv.estimators.pose_estimator import LANDMARK_DTYPE, PoseLandmark, landmark_xyz
+from estv.trackers import kernels
+from estv.trackers.tracker_base import BaseTracker, TrackerBatch
+
+
+# --- 定数
+NUM_POSE_LANDMARKS = 33     # MediaPipe Pose のランドマーク数
+
+# --- 中点を取る部位（左右のランドマーク番号）
+_MIDPOINT_TRACKERS = (
+    ("Hips", 23, 24),       # 腰（左右hipの中点）
+    ("Chest", 11, 12),      # 胸（左右shoulderの中点）
+)
+# --- ランドマークをそのまま使う部位
+_DIRECT_TRACKERS = (
+    ("LeftFoot", 27),       # 両足首
+    ("RightFoot", 28),
+    ("LeftElbow", 13),      # 両肘
+    ("RightElbow", 14),
+)
+
+# --- 出力順の部位名と、中点・直接それぞれのランドマーク番号
+_TRACKER_NAMES = tuple(t[0] for t in _MIDPOINT_TRACKERS + _DIRECT_TRACKERS)
+_MIDPOINT_LEFT = np.array([t[1] for t in _MIDPOINT_TRACKERS], dtype=np.int64)
+_MIDPOINT_RIGHT = np.array([t[2] for t in _MIDPOINT_TRACKERS], dtype=np.int64)
+_DIRECT_INDICES = np.array([t[1] for t in _DIRECT_TRACKERS], dtype=np.int64)
+_NUM_TRACKERS = len(_TRACKER_NAMES)
+
+# --- 全トラッカー・全フレームで共有する単位クォータニオン（書き換え禁止）
+_IDENTITY_ROTATIONS = np.tile(np.array([0.0, 0.0, 0.0, 1.0], dtype=np.float32), (_NUM_TRACKERS, 1))
+_IDENTITY_ROTATIONS.setflags(write=False)
+
+# --- どの部位も計算できない入力（未検出フレームなど）に返す空の結果
+_MIN_LANDMARKS = int(min(_MIDPOINT_LEFT.min(), _MIDPOINT_RIGHT.min(), _DIRECT_INDICES.min())) + 1
+_EMPTY_POSITIONS = np.empty((0, 3), dtype=np.float32)
+_EMPTY_POSITIONS.setflags(write=False)
+_EMPTY_BATCH = TrackerBatch((), _EMPTY_POSITIONS, _IDENTITY_ROTATIONS[:0])
 
 
 class MediaPipeVirtualTracker(BaseTracker):
-    """MediaPipeのランドマークから仮想トラッカー(腰・胸・両足・両肘)を生成"""
+    """MediaPipeのランドマークから仮想トラッカー(腰・胸・両足・両肘)を生成
+
+    結果はインスタンスが持つバッファを指す ``TrackerBatch`` で返し、
+    次の ``update`` 呼び出しまで有効。回転は常に単位クォータニオン。
+    """
+
+    __slots__ = ("_xyz", "_all_pos", "_valid", "_pos")
+
+    _warmed_up = False  # JIT カーネルのコンパイルはプロセスで 1 回だけ行う
+
 
     def __init__(self):
-        pass
-
-
-    def update(self, landmarks: list[PoseLandmark | None]) -> list[VirtualTrackerResult]:
-        results = []
-
-        # --- 1. 腰（左右hipの中点）
-        hips = [23, 24]
-        hip_pts = [landmarks[i] for i in hips if i < len(landmarks) and landmarks[i] is not None]
-        if len(hip_pts) == 2:
-            hip_pos = np.mean([[lm.x, lm.y, lm.z] for lm in hip_pts], axis=0)
-            results.append(VirtualTrackerResult("Hips", hip_pos, np.array([0, 0, 0, 1])))
-
-        # --- 2. 胸（左右shoulderの中点）
-        shoulders = [11, 12]
-        shoulder_pts = [landmarks[i] for i in shoulders if i < len(landmarks) and landmarks[i] is not None]
-        if len(shoulder_pts) == 2:
-            chest_pos = np.mean([[lm.x, lm.y, lm.z] for lm in shoulder_pts], axis=0)
-            results.append(VirtualTrackerResult("Chest", chest_pos, np.array([0, 0, 0, 1])))
-
-        # --- 3. 両足首
-        for side, idx in [("LeftFoot", 27), ("RightFoot", 28)]:
-            if idx < len(landmarks) and landmarks[idx] is not None:
-                lm = landmarks[idx]
-                results.append(VirtualTrackerResult(side, np.array([lm.x, lm.y, lm.z]), np.array([0, 0, 0, 1])))
-
-        # --- 4. 両肘
-        for side, idx in [("LeftElbow", 13), ("RightElbow", 14)]:
-            if idx < len(landmarks) and landmarks[idx] is not None:
-                lm = landmarks[idx]
-                results.append(VirtualTrackerResult(side, np.array([lm.x, lm.y, lm.z]), np.array([0, 0, 0, 1])))
-        return results
+        # 毎フレーム書き直す (33, 3) の座標バッファ（欠損は NaN）
+        self._xyz = np.full((NUM_POSE_LANDMARKS, 3), np.nan, dtype=np.float32)
+        # 全部位の位置（欠損を含む）と、検出できた部位だけを詰めた出力用の位置
+        self._all_pos = np.empty((_NUM_TRACKERS, 3), dtype=np.float32)
+        self._valid = np.empty(_NUM_TRACKERS, dtype=np.bool_)
+        self._pos = np.empty((_NUM_TRACKERS, 3), dtype=np.float32)
+        # 最初のフレームでコンパイル待ちが発生しないよう、構築時に済ませておく
+        if not MediaPipeVirtualTracker._warmed_up:
+            kernels.warm_up()
+            MediaPipeVirtualTracker._warmed_up = True
+
+
+    def _load_landmarks(self, landmarks: list[PoseLandmark | None]) -> np.ndarray:
+        """``PoseLandmark`` のリストを座標バッファへ書き込む（低速な互換経路）。"""
+        xyz = self._xyz
+        xyz.fill(np.nan)
+        for i, lm in enumerate(landmarks[:NUM_POSE_LANDMARKS]):
+            if lm is not None:
+                xyz[i] = (lm.x, lm.y, lm.z)
+        return xyz
+
+
+    def _load_fields(self, landmarks: np.ndarray) -> np.ndarray:
+        """``x`` / ``y`` / ``z`` フィールドを持つ任意の構造化配列を座標バッファへ書き込む。"""
+        xyz = self._xyz
+        xyz.fill(np.nan)
+        n = min(len(landmarks), NUM_POSE_LANDMARKS)
+        for axis, field in enumerate(("x", "y", "z")):
+            xyz[:n, axis] = landmarks[field][:n]
+        return xyz
+
+
+    def update(self, landmarks: list[PoseLandmark | None] | np.ndarray) -> TrackerBatch:
+        """ランドマークのリスト、または ``LANDMARK_DTYPE`` の構造化配列から計算する。"""
+        # 未検出（長さ 0）や使う部位まで届かない入力はバッファに触れずに返す
+        if len(landmarks) < _MIN_LANDMARKS:
+            return _EMPTY_BATCH
+        if isinstance(landmarks, np.ndarray):
+            # estimate_array と同じ C 連続の配列は座標のビューをそのまま渡し、
+            # それ以外（スライスや別の構造化型）はフィールドごとにコピーする
+            if landmarks.dtype == LANDMARK_DTYPE and landmarks.flags.c_contiguous:
+                return self.update_array(landmark_xyz(landmarks))
+            return self.update_array(self._load_fields(landmarks))
+        return self.update_array(self._load_landmarks(landmarks))
+
+
+    def update_array(self, xyz: np.ndarray) -> TrackerBatch:
+        """部位順の (33, 3) 座標配列（欠損は NaN）から仮想トラッカーを計算する。
+
+        33 行に満たない配列は、足りない部位を欠損として扱う。
+        """
+        n = len(xyz)
+        if n < _MIN_LANDMARKS:
+            return _EMPTY_BATCH
+        if n < NUM_POSE_LANDMARKS:
+            buf = self._xyz
+            buf.fill(np.nan)
+            buf[:n] = xyz
+            xyz = buf
+        all_pos, valid = self._all_pos, self._valid
+        k = kernels.virtual_trackers(
+            xyz, _MIDPOINT_LEFT, _MIDPOINT_RIGHT, _DIRECT_INDICES, all_pos, valid
+        )
+        if k == _NUM_TRACKERS:
+            return TrackerBatch(_TRACKER_NAMES, all_pos, _IDENTITY_ROTATIONS)
+        positions = self._pos[:k]
+        np.compress(valid, all_pos, axis=0, out=positions)
+        names = tuple(name for name, ok in zip(_TRACKER_NAMES, valid) if ok)
+        return TrackerBatch(names, positions, _IDENTITY_ROTATIONS[:k])
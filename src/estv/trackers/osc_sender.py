@@ -1,4 +1,59 @@
-from pythonosc.udp_client import SimpleUDPClient
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+import logging
+import socket
+import struct
+import threading
+
+import numpy as np
+
+from estv.trackers.tracker_base import TrackerBatch
+
+
+logger = logging.getLogger(__name__)
+
+
+# --- 定数
+NUM_TRACKERS = 8    # VRChat が受け付けるトラッカー数（番号は 1 から 8）
+SEND_BUFFER_SIZE = 1 << 20  # 送信バッファ（バイト）。瞬間的な送信の集中を吸収する
+IP_TOS_LOW_DELAY = 0x10     # IPv4 の TOS（低遅延）
+SEND_QUEUE_CAPACITY = 256   # 送信スレッドを使う場合に溜めておけるフレーム数
+
+
+def _osc_string(value: str) -> bytes:
+    """OSC 文字列（NUL 終端し 4 バイト境界まで NUL で埋めたもの）にエンコードする。"""
+    data = value.encode("ascii") + b"\x00"
+    return data + b"\x00" * (-len(data) % 4)
+
+
+def _message_header(address: str, type_tags: str, num_args: int) -> bytes:
+    """バンドル要素のサイズ・アドレス・型タグをまとめた、引数より前の部分を返す。"""
+    header = _osc_string(address) + _osc_string(type_tags)
+    return struct.pack(">i", len(header) + 4 * num_args) + header
+
+
+# --- 受け付けるトラッカー番号
+_TRACKER_INDICES = range(1, NUM_TRACKERS + 1)
+
+# --- バンドルの先頭（"#bundle" とタイムタグ 1 = 即時実行）
+_BUNDLE_HEADER = _osc_string("#bundle") + struct.pack(">Q", 1)
+
+# --- トラッカー番号ごとの (パッカー, 位置メッセージの先頭, 回転メッセージの先頭)
+#     アドレスと型タグは固定なので事前にエンコードし、毎フレームは数値だけを詰める
+_TRACKER_PACKERS: tuple[tuple[struct.Struct, bytes, bytes] | None, ...] = (None,) + tuple(
+    (
+        struct.Struct(f">{len(pos)}s3f{len(rot)}s4f"),
+        pos,
+        rot,
+    )
+    for pos, rot in (
+        (
+            _message_header(f"/tracking/trackers/{i}/position", ",fff", 3),
+            _message_header(f"/tracking/trackers/{i}/rotation", ",ffff", 4),
+        )
+        for i in range(1, NUM_TRACKERS + 1)
+    )
+)
 
 
 # Unityの座標系と同じ、左利き座標系、+yが上
@@ -10,16 +65,133 @@ from pythonosc.udp_client import SimpleUDPClient
 
 class VRChatOscTrackerSender:
 
-    def __init__(self, ip="127.0.0.1", port=9000):
-        self.client = SimpleUDPClient(ip, port)
+    def __init__(self, ip="127.0.0.1", port=9000, background=False):
+        """``background=True`` の場合は送信専用スレッドから ``sendto`` する。
+
+        呼び出し側はエンコード済みのデータグラムをキューへ積むだけで戻る。
+        キューが ``SEND_QUEUE_CAPACITY`` を超えたら最も古いフレームを捨てる。
+        """
+        # --- 宛先の名前解決は 1 回だけ行い、以降は解決済みのアドレスへ送る
+        family, _, _, _, address = socket.getaddrinfo(ip, port, type=socket.SOCK_DGRAM)[0]
+        self._sock = socket.socket(family, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+        if family == socket.AF_INET:
+            try:
+                self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, IP_TOS_LOW_DELAY)
+            except OSError:
+                pass    # TOS を変更できない環境ではそのまま送る
+        self._address = address
+        # 送信バッファが埋まっていて捨てたフレーム数
+        self.dropped_frames = 0
+        # 送信キューがあふれて捨てた（古い）フレーム数
+        self.overflowed_frames = 0
+        self._closed = False
+
+        # --- 送信スレッド（deque の append / popleft はロックなしでスレッド間で使える）
+        self._queue: deque[bytes] | None = None
+        self._thread: threading.Thread | None = None
+        if background:
+            self._queue = deque(maxlen=SEND_QUEUE_CAPACITY)
+            self._wake = threading.Event()
+            self._closing = False
+            self._thread = threading.Thread(
+                target=self._run_sender, name="osc-sender", daemon=True
+            )
+            self._thread.start()
+
+
+    def send_trackers(self, items: Iterable[tuple[int, Sequence[float], Sequence[float]]]):
+        """``(tracker_index, position, rotation)`` の並びを 1 つの OSC バンドルで送る。
+
+        全トラッカーの位置・回転をまとめて 1 データグラム（sendto 1 回）にする。
+        ソケットは非ブロッキングで、送信バッファが埋まっている場合はそのフレームを捨てる。
+        ``tracker_index`` は 1 から ``NUM_TRACKERS`` まで。``close()`` 後に呼ぶと
+        ``RuntimeError`` を送出する（送られないフレームを黙って積まない）。
+        """
+        if self._closed:
+            raise RuntimeError("close() 済みの送信側には送れません。")
+        # --- ループ内で参照するものはローカルに取り出しておく（属性・グローバル参照を省く）
+        packers, indices = _TRACKER_PACKERS, _TRACKER_INDICES
+        parts = [_BUNDLE_HEADER]
+        append = parts.append
+        for tracker_index, position, rotation in items:
+            # range の in は型の異なる値でも例外を出さずに False を返す
+            if tracker_index not in indices:
+                raise ValueError(
+                    f"tracker_index は 1 から {NUM_TRACKERS} の整数で指定してください: {tracker_index!r}"
+                )
+            packer, pos_header, rot_header = packers[tracker_index]
+            append(packer.pack(
+                pos_header, position[0], position[1], position[2],
+                rot_header, rotation[0], rotation[1], rotation[2], rotation[3],
+            ))
+        data = b"".join(parts)
+        queue = self._queue
+        if queue is None:
+            self._send_datagram(data)
+            return
+        if len(queue) == SEND_QUEUE_CAPACITY:
+            # maxlen の deque は先頭（最も古いフレーム）を捨てて追加する
+            if not self.overflowed_frames:
+                logger.warning("OSC send queue is full; dropping the oldest frames")
+            self.overflowed_frames += 1
+        queue.append(data)
+        self._wake.set()
+
+
+    def _send_datagram(self, data: bytes) -> None:
+        try:
+            self._sock.sendto(data, self._address)
+        except BlockingIOError:
+            # 送信待ちで推定側を止めない。次のフレームで最新値が届くためこのフレームは捨てる
+            self.dropped_frames += 1
+
+
+    def _run_sender(self) -> None:
+        """送信スレッド本体。キューに積まれたデータグラムを順に送る。"""
+        queue, wake = self._queue, self._wake
+        while True:
+            wake.wait()
+            wake.clear()
+            while queue:
+                self._send_datagram(queue.popleft())
+            if self._closing:
+                return
+
+
+    def send_batch(self, batch: TrackerBatch, tracker_indices: Mapping[str, int]):
+        """``batch`` の各部位を ``tracker_indices`` で対応付けた番号で 1 バンドルにして送る。"""
+        # 配列は tolist() で一括して Python の float に変換し、部位ごとの取り出しを省く
+        self.send_trackers(zip(
+            [tracker_indices[name] for name in batch.names],
+            batch.positions.tolist(),
+            batch.rotations.tolist(),
+        ))
 
 
     def send_tracker(self, tracker_index, position, rotation):
-        self.client.send_message(
-            f"/tracking/trackers/{tracker_index}/position",
-            [float(position[0]), float(position[1]), float(position[2])]
-        )
-        self.client.send_message(
-            f"/tracking/trackers/{tracker_index}/rotation",
-            [float(rotation[0]), float(rotation[1]), float(rotation[2]), float(rotation[3])]
-        )
+        # 配列は要素ごとに NumPy スカラーを作らず、tolist() で一度に Python の float にする
+        if isinstance(position, np.ndarray):
+            position = position.tolist()
+        if isinstance(rotation, np.ndarray):
+            rotation = rotation.tolist()
+        self.send_trackers(((tracker_index, position, rotation),))
+
+
+    def close(self):
+        """送信スレッドを止め（積まれたフレームは送り切る）、ソケットを閉じる。
+
+        2 回目以降の呼び出しは何もしない。
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._closing = True
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        # 送信スレッドはもう取り出さないため、キューも手放す
+        self._queue = None
+        self._sock.close()
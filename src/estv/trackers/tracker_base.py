@@ -1,21 +1,60 @@
-from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Protocol
 
 import numpy as np
 
 from estv.estimators.pose_estimator import PoseLandmark
 
 
+@dataclass(slots=True, eq=False)
 class VirtualTrackerResult:
+    """1 つの仮想トラッカーの推定結果。
 
-    def __init__(self, name: str, position: np.ndarray, rotation: np.ndarray):
-        self.name = name  # e.g. "Hips", "Head"
-        self.position = position  # shape: (3,)
-        self.rotation = rotation  # shape: (4,) quaternion
+    配列同士の == は真偽値にならないため、比較は従来どおり同一性で行う（eq=False）。
+    """
 
+    name: str               # e.g. "Hips", "Head"
+    position: np.ndarray    # shape: (3,)
+    rotation: np.ndarray    # shape: (4,) quaternion（共有される場合があるため書き換えない）
 
-class BaseTracker(ABC):
 
-    @abstractmethod
-    def update(self, landmarks: list[PoseLandmark | None]) -> list[VirtualTrackerResult]:
-        """与えられた姿勢推定ランドマークから仮想トラッカー情報を計算して返す。"""
-        raise NotImplementedError
+@dataclass(slots=True, eq=False)
+class TrackerBatch:
+    """1 フレーム分の仮想トラッカーを部位ごとの並列配列で保持する。
+
+    ``positions[i]`` と ``rotations[i]`` が ``names[i]`` の部位に対応する。
+    配列はトラッカー側のバッファを指すことがあるため、書き換えず、
+    保持する場合はコピーすること。
+    """
+
+    names: tuple[str, ...]
+    positions: np.ndarray   # shape: (N, 3) float32
+    rotations: np.ndarray   # shape: (N, 4) float32 quaternion
+
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+    def __iter__(self) -> Iterator[VirtualTrackerResult]:
+        """部位ごとの ``VirtualTrackerResult`` として順に取り出す。"""
+        for name, position, rotation in zip(self.names, self.positions, self.rotations):
+            yield VirtualTrackerResult(name, position, rotation)
+
+
+class BaseTracker(Protocol):
+    """仮想トラッカーの構造的なインターフェース。
+
+    ABC による抽象メソッドの検査は行わず、型チェック用にのみ使う。
+    """
+
+    __slots__ = ()
+
+
+    def update(self, landmarks: list[PoseLandmark | None] | np.ndarray) -> TrackerBatch:
+        """与えられた姿勢推定ランドマークから仮想トラッカー情報を計算して返す。
+
+        ``landmarks`` は ``PoseLandmark`` のリスト、または ``LANDMARK_DTYPE`` の構造化配列。
+        """
+        ...
@@ -1,8 +1,15 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import threading
+import time
+
 import cv2
 import numpy as np
 import pytest
+from PySide6.QtWidgets import QApplication
 
-from estv.devices.camera_calibrator import CameraCalibrator
+from estv.devices.camera_calibrator import CameraCalibrator, calibrate_and_save_async
 
 
 def generate_chessboard(board_size=(6, 9), square_size=40):
@@ -49,3 +56,89 @@ def test_calibrate_requires_three_images():
         calib.add_chessboard_image(img)
     with pytest.raises(ValueError):
         calib.calibrate(img.shape[:2])
+
+
+def test_add_chessboard_image_rejects_blank_frame():
+    calib = CameraCalibrator()
+    img = np.full((480, 640, 3), 128, dtype=np.uint8)
+    assert not calib.add_chessboard_image(img)
+    assert calib.image_points == []
+
+
+def test_save_load_without_reprojection_error(tmp_path):
+    calib = CameraCalibrator()
+    calib._camera_matrix = np.eye(3)
+    calib._dist_coeffs = np.zeros((1, 5))
+
+    filename = tmp_path / "calib.npz"
+    calib.save(filename)
+
+    loaded = CameraCalibrator()
+    loaded.load(filename)
+    assert np.allclose(loaded.camera_matrix, np.eye(3))
+    assert loaded.reprojection_error is None
+
+
+def test_large_image_detected_via_pyramid():
+    img = generate_chessboard(square_size=100)
+    assert max(img.shape[:2]) >= 640
+    calib = CameraCalibrator()
+    assert calib.add_chessboard_image(img)
+
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    found, ref = cv2.findChessboardCornersSB(gray, calib.board_size)
+    assert found
+    assert np.abs(calib.image_points[0] - ref).max() < 0.5
+
+
+def test_undistort_maps_are_cached(tmp_path):
+    calib = CameraCalibrator()
+    with pytest.raises(ValueError):
+        calib.get_undistort_maps((320, 240))
+
+    calib._camera_matrix = np.array([[300.0, 0, 160], [0, 300.0, 120], [0, 0, 1]])
+    calib._dist_coeffs = np.zeros((1, 5))
+    map1, map2, new_k = calib.get_undistort_maps((320, 240))
+    assert map1.shape[:2] == (240, 320)
+    assert calib.get_undistort_maps((320, 240))[0] is map1
+
+    filename = tmp_path / "calib.npz"
+    calib.save(filename)
+    calib.load(filename)
+    assert calib.get_undistort_maps((320, 240))[0] is not map1
+
+
+def _wait_for(app, results, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not results and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_calibrate_and_save_async(tmp_path):
+    app = QApplication.instance() or QApplication([])
+    calib = CameraCalibrator()
+    img = generate_chessboard()
+    for _ in range(3):
+        calib.add_chessboard_image(img)
+    filename = tmp_path / "calib.npz"
+    results = []
+    calibrate_and_save_async(
+        calib, img.shape[:2], filename,
+        on_done=lambda r: results.append((r, threading.current_thread())),
+    )
+    _wait_for(app, results)
+
+    result, thread = results[0]
+    assert isinstance(result, float)
+    assert thread is threading.main_thread()
+    assert filename.exists()
+
+    # 失敗時は例外が渡され、ファイルは作られない
+    results.clear()
+    calibrate_and_save_async(
+        CameraCalibrator(), img.shape[:2], tmp_path / "none.npz", on_done=results.append
+    )
+    _wait_for(app, results)
+    assert isinstance(results[0], ValueError)
+    assert not (tmp_path / "none.npz").exists()
@@ -1,9 +1,30 @@
 import os
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
 from PySide6.QtWidgets import QApplication
 
-from estv.gui.camera_preview_window import CameraPreviewWindow
+import estv.gui.camera_preview_window as cpw
+from estv.gui.camera_preview_window import (
+    CALIB_CAPTURE_FRAME_STRIDE,
+    CameraPreviewWindow,
+    PoseEstimationWorker,
+    _PreviewLabel,
+    _SettingsWriter,
+    _get_data_dir as _real_get_data_dir,
+)
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """設定・キャリブレーションの保存先を一時ディレクトリへ向ける（リポジトリの data/ に書かない）。"""
+    monkeypatch.setattr(cpw, "_get_data_dir", lambda: tmp_path)
+    return tmp_path
 
 
 class DummySignal:
@@ -16,7 +37,6 @@ class DummySignal:
 
 class DummyCameraStreamManager:
     def __init__(self):
-        self.q_image_ready = DummySignal()
         self.frame_ready = DummySignal()
 
     def set_exposure(self, device_id, value):
@@ -44,3 +64,202 @@ def test_calib_button_disabled_during_pose_estimation():
     assert window.calib_button.isEnabled()
 
     window.close()
+
+
+def test_pose_worker_keeps_only_latest_frame():
+    app = QApplication.instance() or QApplication([])
+    worker = PoseEstimationWorker()
+    results = []
+    worker.result_ready.connect(results.append)
+    try:
+        assert worker._estimator is None  # 推定器は最初のフレームで借りる
+        # 推論開始前に届いたフレームは最新の 1 枚だけが処理される
+        for h in (48, 50, 52):
+            worker.submit(np.zeros((h, 64, 3), dtype=np.uint8))
+        app.processEvents()
+        assert [r.shape for r in results] == [(52, 64, 3)]
+
+        worker.stop()
+        worker.submit(np.zeros((48, 64, 3), dtype=np.uint8))
+        app.processEvents()
+        assert len(results) == 1
+    finally:
+        worker.close()
+
+
+def test_preview_label_paints_frame_into_reused_buffer():
+    app = QApplication.instance() or QApplication([])
+    label = _PreviewLabel("no signal")
+    label.setFixedSize(120, 120)
+
+    frame = np.zeros((30, 40, 3), dtype=np.uint8)
+    frame[:] = (255, 0, 0)  # BGR の青
+    label.set_frame(frame)
+    buf = label._buf
+    label.set_frame(frame)
+    app.processEvents()
+
+    assert label._buf is buf
+    assert label.text() == ""
+    color = label.grab().toImage().pixelColor(60, 60)
+    assert (color.red(), color.green(), color.blue()) == (0, 0, 255)
+
+
+def test_settings_writer_keeps_latest_and_flushes(tmp_path):
+    path = tmp_path / "settings.json"
+    writer = _SettingsWriter(str(path))
+    for value in range(5):
+        writer.request_save({"exposure": value})
+    writer.flush()
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"exposure": 4}
+    assert not (tmp_path / "settings.json.tmp").exists()
+
+
+def test_hidden_window_skips_preview_update():
+    app = QApplication.instance() or QApplication([])
+    window = CameraPreviewWindow(DummyCameraStreamManager(), device_id="0")
+    frame = np.zeros((30, 40, 3), dtype=np.uint8)
+
+    window._on_frame_ready("0", frame)
+    assert not window._render_timer.isActive()
+    assert window._last_image is frame
+
+    window.show()
+    app.processEvents()
+    window._on_frame_ready("0", frame)
+    window._on_frame_ready("0", frame)  # 描画予約済みなら追加の予約はしない
+    assert window._render_timer.isActive()
+    while window._render_timer.isActive():
+        app.processEvents()
+    assert window.image_label._buf is not None
+
+    window.close()
+
+
+class CountingCalibrator:
+    def __init__(self):
+        self.image_points = []
+        self.calls = 0
+        self.threads = set()
+
+    def add_chessboard_image(self, image):
+        self.calls += 1
+        self.threads.add(threading.current_thread())
+        return False
+
+
+def _drain_calib_detection(app, window, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while window._calib_detecting and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_calib_detection_runs_every_stride_frames_off_gui_thread():
+    app = QApplication.instance() or QApplication([])
+    window = CameraPreviewWindow(DummyCameraStreamManager(), device_id="0")
+    window.calibrating = True
+    window.calibrator = CountingCalibrator()
+
+    for _ in range(2):
+        for _ in range(CALIB_CAPTURE_FRAME_STRIDE):
+            window._on_frame_ready("0", np.zeros((30, 40, 3), dtype=np.uint8))
+        _drain_calib_detection(app, window)
+    assert window.calibrator.calls == 2
+    assert threading.main_thread() not in window.calibrator.threads
+
+    # 検出中に届いた検出対象フレームは見送られる
+    for _ in range(2 * CALIB_CAPTURE_FRAME_STRIDE):
+        window._on_frame_ready("0", np.zeros((30, 40, 3), dtype=np.uint8))
+    _drain_calib_detection(app, window)
+    assert window.calibrator.calls == 3
+
+    window.calibrating = False
+    for _ in range(CALIB_CAPTURE_FRAME_STRIDE):
+        window._on_frame_ready("0", np.zeros((30, 40, 3), dtype=np.uint8))
+    assert not window._calib_detecting
+    window.close()
+
+
+def test_window_loads_settings_and_tolerates_missing_files(data_dir):
+    app = QApplication.instance() or QApplication([])
+
+    window = CameraPreviewWindow(DummyCameraStreamManager(), device_id="0")
+    assert window._exposure_value == -7
+    assert not window.calibration_done
+    window.close()
+
+    (data_dir / "settings_0.json").write_text(
+        json.dumps({"exposure": -3, "brightness": 12}), encoding="utf-8"
+    )
+    window = CameraPreviewWindow(DummyCameraStreamManager(), device_id="0")
+    assert (window._exposure_value, window._brightness_value) == (-3, 12)
+    window.close()
+
+
+def test_data_dir_is_created_once_per_process(tmp_path, monkeypatch):
+    from pathlib import Path
+
+    # 実際の _get_data_dir を使い、基準ディレクトリ（モジュールの 4 階層上）だけ一時ディレクトリへ向ける
+    monkeypatch.setattr(cpw, "_get_data_dir", _real_get_data_dir)
+    monkeypatch.setattr(
+        cpw, "__file__", str(tmp_path / "src" / "estv" / "gui" / "camera_preview_window.py")
+    )
+    calls = []
+    real_mkdir = Path.mkdir
+
+    def counting_mkdir(self, *args, **kwargs):
+        calls.append(self)
+        return real_mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+    cpw._get_data_dir.cache_clear()
+    try:
+        cpw._calib_file_path("0")
+        cpw._settings_file_path("0")
+        cpw._settings_file_path("1")
+        assert len(calls) == 1
+        assert (tmp_path / "data").is_dir()
+    finally:
+        cpw._get_data_dir.cache_clear()
+
+
+class RecordingCameraStreamManager(DummyCameraStreamManager):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def set_exposure(self, device_id, value):
+        self.calls.append(("exposure", value))
+
+    def stop_camera(self, device_id):
+        self.calls.append(("stop",))
+
+
+def test_suspend_hides_window_and_resume_reapplies_settings(data_dir):
+    app = QApplication.instance() or QApplication([])
+    manager = RecordingCameraStreamManager()
+    closed = []
+    window = CameraPreviewWindow(manager, device_id="0", on_closed=closed.append)
+    window.show()
+    window._on_frame_ready("0", np.zeros((30, 40, 3), dtype=np.uint8))
+
+    manager.calls.clear()
+    window.suspend()
+    assert not window.isVisible()
+    assert window.latest_frame is None
+    assert manager.calls == [("stop",)]
+    assert (data_dir / "settings_0.json").exists()
+
+    window.exposure_slider.setValue(-5)
+    manager.calls.clear()
+    window.resume()
+    assert window.isVisible()
+    assert ("exposure", -5.0) in manager.calls
+
+    window.suspend()
+    manager.calls.clear()
+    window.force_close()
+    assert manager.calls == []  # 停止済みのストリームは止め直さない
+    assert closed == ["0"]
@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+
+import estv.devices.camera_stream as stream_module
+from estv.devices.camera_stream import CameraStream, resize_if_needed
+
+
+class FakeCapture:
+    def __init__(self, *args):
+        self.exposures = []
+        self.grabs = 0
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return {cv2.CAP_PROP_FRAME_WIDTH: 320, cv2.CAP_PROP_FRAME_HEIGHT: 240}.get(prop, 0)
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_EXPOSURE:
+            self.exposures.append(value)
+        return True
+
+    def grab(self):
+        self.grabs += 1
+        return self.grabs <= 5
+
+    def retrieve(self, image=None):
+        return True, np.zeros((240, 320, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+def test_brightness_lut_matches_convert_scale_abs():
+    stream = CameraStream(0)
+    frame = np.random.default_rng(0).integers(0, 256, (48, 64, 3), dtype=np.uint8)
+
+    stream.set_brightness(35)
+    expected = cv2.convertScaleAbs(frame, alpha=1.35, beta=0)
+    assert np.array_equal(cv2.LUT(frame, stream._brightness_lut), expected)
+
+    stream.set_brightness(0)
+    assert stream._brightness_lut is None
+
+
+def test_resize_if_needed_keeps_aspect_ratio():
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    assert resize_if_needed(frame, 320).shape == (180, 320, 3)
+
+    small = np.zeros((240, 320, 3), dtype=np.uint8)
+    assert resize_if_needed(small, 320) is small
+
+
+def test_frame_stride_is_at_least_one():
+    stream = CameraStream(0)
+    stream.set_frame_stride(15)
+    assert stream._frame_stride == 15
+    stream.set_frame_stride(0)
+    assert stream._frame_stride == 1
+
+
+def test_exposure_is_applied_from_capture_loop(monkeypatch):
+    captures = []
+
+    def make_capture(*args):
+        captures.append(FakeCapture())
+        return captures[-1]
+
+    monkeypatch.setattr(stream_module.cv2, "VideoCapture", make_capture)
+    monkeypatch.setattr(stream_module, "CAPTURE_FPS", 100000)
+    stream = CameraStream(0)
+    stream.set_exposure(-6.0)
+    frames = []
+
+    def on_frame(frame):
+        frames.append(frame)
+        stream.set_exposure(-4.0)
+
+    stream.frame_ready.connect(on_frame)
+    stream.run()
+
+    assert frames
+    # --- 受信側で共有するため、送出フレームは読み取り専用
+    assert not any(frame.flags.writeable for frame in frames)
+    # --- 同じ値は再設定しない
+    assert captures[0].exposures == [-6.0, -4.0]
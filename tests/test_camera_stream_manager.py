@@ -1,5 +1,9 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 import warnings
 
+from PySide6.QtWidgets import QApplication
+
 import estv.devices.camera_stream_manager as mgr_module
 from estv.devices.camera_stream_manager import CameraStreamManager
 
@@ -15,7 +19,6 @@ class DummySignal:
 class DummyStream:
     def __init__(self, device_index):
         self.frame_ready = DummySignal()
-        self.q_image_ready = DummySignal()
         self.error = DummySignal()
         self.finished = DummySignal()
 
@@ -49,3 +52,107 @@ def test_cannot_start_more_than_two_cameras(monkeypatch):
         manager.start_camera("2")
         assert len(manager.running_device_ids()) == 2
         assert any("Cannot start" in str(warn.message) for warn in w)
+
+
+def test_streams_updated_handler_can_query_manager(monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.setattr(mgr_module, "CameraStream", DummyStream)
+    manager = CameraStreamManager(lambda cid: int(cid))
+    seen = []
+    manager.streams_updated.connect(lambda: seen.append(manager.running_device_ids()))
+
+    manager.start_camera("0")
+    app.processEvents()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        manager.start_camera("0")
+    app.processEvents()
+
+    assert seen == [["0"], ["0"]]
+
+
+def test_stop_all_emits_streams_updated_once(monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.setattr(mgr_module, "CameraStream", DummyStream)
+    manager = CameraStreamManager(lambda cid: int(cid))
+    manager.start_camera("0")
+    manager.start_camera("1")
+    app.processEvents()
+
+    count = []
+    manager.streams_updated.connect(lambda: count.append(1))
+    manager.stop_all()
+    app.processEvents()
+
+    assert manager.running_device_ids() == []
+    assert len(count) == 1
+
+
+def test_stop_all_requests_every_stop_before_waiting(monkeypatch):
+    calls = []
+
+    class RecordingStream(DummyStream):
+        def __init__(self, device_index):
+            super().__init__(device_index)
+            self._index = device_index
+
+        def stop(self):
+            calls.append(("stop", self._index))
+
+        def wait(self):
+            calls.append(("wait", self._index))
+
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.setattr(mgr_module, "CameraStream", RecordingStream)
+    manager = CameraStreamManager(lambda cid: int(cid))
+    manager.start_camera("0")
+    manager.start_camera("1")
+
+    manager.stop_all()
+    app.processEvents()
+
+    assert calls == [("stop", 0), ("stop", 1), ("wait", 0), ("wait", 1)]
+    assert manager.running_device_ids() == []
+
+
+def test_setters_forward_to_running_stream_only(monkeypatch):
+    calls = []
+
+    class RecordingStream(DummyStream):
+        def set_exposure(self, value):
+            calls.append(("exposure", value))
+
+        def set_brightness(self, value):
+            calls.append(("brightness", value))
+
+        def set_frame_stride(self, stride):
+            calls.append(("stride", stride))
+
+    monkeypatch.setattr(mgr_module, "CameraStream", RecordingStream)
+    manager = CameraStreamManager(lambda cid: int(cid))
+    manager.start_camera("0")
+
+    manager.set_exposure("0", -5.0)
+    manager.set_brightness("0", 20.0)
+    manager.set_frame_stride("0", 2)
+    manager.set_exposure("1", -3.0)
+
+    assert calls == [("exposure", -5.0), ("brightness", 20.0), ("stride", 2)]
+
+
+def test_stale_finished_does_not_remove_restarted_stream(monkeypatch):
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.setattr(mgr_module, "CameraStream", DummyStream)
+    manager = CameraStreamManager(lambda cid: int(cid))
+    manager.start_camera("0")
+    old_adapter = manager._adapters["0"]
+
+    manager.stop_camera("0")
+    manager.start_camera("0")
+    new_stream = manager._streams["0"]
+    # --- 停止済みストリームの finished が遅れて届いた場合
+    old_adapter.on_finished()
+    app.processEvents()
+
+    assert manager.running_device_ids() == ["0"]
+    assert manager._streams["0"] is new_stream
@@ -0,0 +1,89 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from estv.gui.camera_table_model import (
+    COLUMN_ID,
+    COLUMN_NAME,
+    COLUMN_STATUS,
+    CameraTableModel,
+)
+
+
+INFOS = [
+    {"id": "cam-a", "name": "Front"},
+    {"id": "cam-b", "name": "Side"},
+    {"id": "cam-c", "name": "Top"},
+]
+
+
+def _status(model, row):
+    return model.data(model.index(row, COLUMN_STATUS))
+
+
+def test_model_reports_names_and_status():
+    app = QApplication.instance() or QApplication([])
+    model = CameraTableModel()
+    model.set_camera_infos(INFOS)
+
+    assert model.rowCount() == 3
+    assert model.data(model.index(1, COLUMN_NAME)) == "Side"
+    assert [_status(model, r) for r in range(3)] == ["停止中"] * 3
+
+    model.set_running({"cam-b"}, estimating=False)
+    assert [_status(model, r) for r in range(3)] == ["停止中", "起動中", "停止中"]
+    model.set_running({"cam-b"}, estimating=True)
+    assert _status(model, 1) == "推定中"
+
+
+def test_set_running_notifies_only_changed_status_cells():
+    app = QApplication.instance() or QApplication([])
+    model = CameraTableModel()
+    model.set_camera_infos(INFOS)
+    changed = []
+    model.dataChanged.connect(
+        lambda top, bottom, roles: changed.append((top.row(), top.column(), bottom.row()))
+    )
+
+    model.set_running({"cam-a", "cam-c"}, estimating=False)
+    assert changed == [(0, COLUMN_STATUS, 0), (2, COLUMN_STATUS, 2)]
+
+    changed.clear()
+    model.set_running({"cam-a", "cam-c"}, estimating=False)
+    assert changed == []
+
+    model.set_running({"cam-c"}, estimating=False)
+    assert changed == [(0, COLUMN_STATUS, 0)]
+
+    # 推定状態の切り替えは起動中の行だけに影響する
+    changed.clear()
+    model.set_running({"cam-c"}, estimating=True)
+    assert changed == [(2, COLUMN_STATUS, 2)]
+
+
+def test_device_list_update_keeps_widgets_of_remaining_rows():
+    app = QApplication.instance() or QApplication([])
+    from PySide6.QtWidgets import QPushButton, QTableView
+    from estv.gui.camera_table_model import COLUMN_ACTION
+
+    model = CameraTableModel()
+    view = QTableView()
+    view.setModel(model)
+    model.set_camera_infos(INFOS)
+    buttons = {}
+    for row in range(model.rowCount()):
+        buttons[model.camera_id(row)] = QPushButton()
+        view.setIndexWidget(model.index(row, COLUMN_ACTION), buttons[model.camera_id(row)])
+
+    model.set_camera_infos([INFOS[0], {"id": "cam-d", "name": "New"}, INFOS[2]])
+
+    assert [model.camera_id(r) for r in range(3)] == ["cam-a", "cam-d", "cam-c"]
+    assert view.indexWidget(model.index(0, COLUMN_ACTION)) is buttons["cam-a"]
+    assert view.indexWidget(model.index(1, COLUMN_ACTION)) is None
+    assert view.indexWidget(model.index(2, COLUMN_ACTION)) is buttons["cam-c"]
+    assert model.data(model.index(1, COLUMN_NAME)) == "New"
+
+    model.set_camera_infos([{"id": "cam-e"}] + INFOS)
+    assert [model.data(model.index(r, COLUMN_ID)) for r in range(4)] == ["0", "1", "2", "3"]
+    assert model.data(model.index(0, COLUMN_NAME)) == "Camera 0"
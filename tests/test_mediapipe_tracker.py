@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from estv.estimators.pose_estimator import (
+    LANDMARK_DTYPE,
+    PoseLandmark,
+    landmark_xyz,
+    landmarks_from_array,
+)
+from estv.trackers.mediapipe_tracker import MediaPipeVirtualTracker
+
+
+def make_landmarks():
+    arr = np.zeros(33, dtype=LANDMARK_DTYPE)
+    arr["x"] = np.arange(33) * 0.01
+    arr["y"] = np.arange(33) * 0.02
+    arr["z"] = -np.arange(33) * 0.03
+    arr["visibility"] = 1.0
+    # 右足首は未検出
+    arr["x"][28] = arr["y"][28] = arr["z"][28] = np.nan
+    return arr
+
+
+def test_update_matches_for_list_and_structured_array():
+    arr = make_landmarks()
+    tracker = MediaPipeVirtualTracker()
+    from_list = tracker.update(landmarks_from_array(arr))
+    list_names, list_positions = from_list.names, from_list.positions.copy()
+    from_array = tracker.update(arr)
+
+    assert list_names == ("Hips", "Chest", "LeftFoot", "LeftElbow", "RightElbow")
+    assert list_names == from_array.names
+    assert from_array.positions.shape == (5, 3)
+    assert from_array.positions.dtype == np.float32
+    assert np.allclose(list_positions, from_array.positions)
+    assert np.allclose(from_array.positions[0], [0.235, 0.47, -0.705])
+    assert np.allclose(from_array.positions[2], [0.27, 0.54, -0.81])
+
+
+def test_batch_rotations_are_read_only_identity():
+    batch = MediaPipeVirtualTracker().update(make_landmarks())
+    assert batch.rotations.shape == (5, 4)
+    assert np.array_equal(batch.rotations, np.tile([0, 0, 0, 1], (5, 1)))
+    assert not batch.rotations.flags.writeable
+
+
+def test_batch_iterates_as_results():
+    batch = MediaPipeVirtualTracker().update(make_landmarks())
+    results = list(batch)
+    assert [r.name for r in results] == list(batch.names)
+    assert np.array_equal(results[1].position, batch.positions[1])
+
+
+def test_short_or_missing_landmarks_yield_no_trackers():
+    tracker = MediaPipeVirtualTracker()
+    assert len(tracker.update([])) == 0
+    assert len(tracker.update(np.empty(0, dtype=LANDMARK_DTYPE))) == 0
+    assert len(tracker.update([PoseLandmark(0.1, 0.2, 0.3, 1.0)] * 11)) == 0
+    lms = [PoseLandmark(0.1, 0.2, 0.3, 1.0)] * 25  # 足首 (27, 28) まで届かない
+    assert tracker.update(lms).names == ("Hips", "Chest", "LeftElbow", "RightElbow")
+
+
+def test_update_array_reads_xyz_view_without_copy():
+    arr = make_landmarks()
+    xyz = landmark_xyz(arr)
+    assert xyz.shape == (33, 3)
+    assert np.shares_memory(xyz, arr)
+
+    tracker = MediaPipeVirtualTracker()
+    from_view = tracker.update_array(xyz)
+    names, positions = from_view.names, from_view.positions.copy()
+    plain = tracker.update_array(np.ascontiguousarray(xyz))
+    assert names == plain.names
+    assert np.allclose(positions, plain.positions)
+
+
+def test_strided_and_other_dtype_arrays_fall_back_to_field_copy():
+    arr = make_landmarks()
+    tracker = MediaPipeVirtualTracker()
+    expected = tracker.update(arr)
+    names, positions = expected.names, expected.positions.copy()
+
+    # 2 倍に間引いた配列のスライス（C 連続ではない）
+    doubled = np.zeros(66, dtype=LANDMARK_DTYPE)
+    doubled[::2] = arr
+    strided = tracker.update(doubled[::2])
+    assert strided.names == names
+    assert np.allclose(strided.positions, positions)
+
+    # 座標が float64 の別の構造化型
+    other = np.zeros(33, dtype=[("x", np.float64), ("y", np.float64), ("z", np.float64)])
+    for field in ("x", "y", "z"):
+        other[field] = arr[field]
+    converted = tracker.update(other)
+    assert converted.names == names
+    assert np.allclose(converted.positions, positions)
+
+
+def test_landmark_xyz_rejects_arrays_it_cannot_view():
+    with pytest.raises(ValueError):
+        landmark_xyz(make_landmarks()[::2])
+    with pytest.raises(ValueError):
+        landmark_xyz(np.zeros((33, 4), dtype=np.float32))
+
+def test_loop_kernel_matches_numpy_kernel():
+    from estv.trackers import kernels
+
+    xyz = landmark_xyz(make_landmarks())
+    left, right = np.array([23, 11]), np.array([24, 12])
+    direct = np.array([27, 28, 13, 14])
+    results = []
+    for kernel in (kernels._virtual_trackers_loop, kernels._virtual_trackers_numpy):
+        out = np.empty((6, 3), dtype=np.float32)
+        valid = np.empty(6, dtype=np.bool_)
+        count = kernel(xyz, left, right, direct, out, valid)
+        results.append((count, out, valid))
+    (count_a, out_a, valid_a), (count_b, out_b, valid_b) = results
+    assert count_a == count_b == 5
+    assert np.array_equal(valid_a, valid_b)
+    assert np.allclose(out_a[valid_a], out_b[valid_b])
+
+
+def test_jit_kernel_matches_numpy_kernel_for_contiguous_and_strided_input():
+    pytest.importorskip("numba")
+    from estv.trackers import kernels
+
+    assert kernels.virtual_trackers is not kernels._virtual_trackers_numpy
+    kernels.warm_up()
+    strided = landmark_xyz(make_landmarks())
+    left, right = np.array([23, 11]), np.array([24, 12])
+    direct = np.array([27, 28, 13, 14])
+    for xyz in (np.ascontiguousarray(strided), strided):
+        jit_out = np.empty((6, 3), dtype=np.float32)
+        jit_valid = np.empty(6, dtype=np.bool_)
+        np_out = np.empty((6, 3), dtype=np.float32)
+        np_valid = np.empty(6, dtype=np.bool_)
+        jit_count = kernels.virtual_trackers(xyz, left, right, direct, jit_out, jit_valid)
+        np_count = kernels._virtual_trackers_numpy(xyz, left, right, direct, np_out, np_valid)
+        assert jit_count == np_count == 5
+        assert np.array_equal(jit_valid, np_valid)
+        assert np.allclose(jit_out[jit_valid], np_out[np_valid])
@@ -0,0 +1,157 @@
+import re
+import socket
+
+import numpy as np
+import pytest
+from pythonosc.osc_bundle import OscBundle
+
+from estv.trackers.osc_sender import NUM_TRACKERS, VRChatOscTrackerSender
+from estv.trackers.tracker_base import TrackerBatch
+
+
+def _receiver() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+    return sock
+
+
+def test_send_trackers_packs_all_trackers_into_one_bundle():
+    sock = _receiver()
+    sender = VRChatOscTrackerSender("127.0.0.1", sock.getsockname()[1])
+    try:
+        sender.send_trackers([
+            (1, np.array([0.1, 0.2, 0.3], dtype=np.float32), np.array([0, 0, 0, 1], dtype=np.float32)),
+            (2, (1.0, 2.0, 3.0), (0.0, 0.0, 0.0, 1.0)),
+        ])
+        bundle = OscBundle(sock.recv(65536))
+        messages = [(m.address, m.params) for m in bundle]
+        assert [address for address, _ in messages] == [
+            "/tracking/trackers/1/position",
+            "/tracking/trackers/1/rotation",
+            "/tracking/trackers/2/position",
+            "/tracking/trackers/2/rotation",
+        ]
+        assert np.allclose(messages[0][1], [0.1, 0.2, 0.3])
+        assert messages[2][1] == [1.0, 2.0, 3.0]
+        assert messages[3][1] == [0.0, 0.0, 0.0, 1.0]
+        # 1 回の呼び出しで送られるデータグラムは 1 つだけ
+        sock.settimeout(0.1)
+        try:
+            sock.recv(65536)
+            extra = True
+        except socket.timeout:
+            extra = False
+        assert not extra
+    finally:
+        sender.close()
+        sock.close()
+
+
+def test_send_tracker_uses_the_last_supported_index():
+    sock = _receiver()
+    sender = VRChatOscTrackerSender("127.0.0.1", sock.getsockname()[1])
+    try:
+        sender.send_tracker(NUM_TRACKERS, [0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0])
+        bundle = OscBundle(sock.recv(65536))
+        assert [m.address for m in bundle] == [
+            f"/tracking/trackers/{NUM_TRACKERS}/position",
+            f"/tracking/trackers/{NUM_TRACKERS}/rotation",
+        ]
+    finally:
+        sender.close()
+        sock.close()
+
+
+def test_send_batch_maps_names_to_tracker_indices():
+    sock = _receiver()
+    sender = VRChatOscTrackerSender("127.0.0.1", sock.getsockname()[1])
+    try:
+        batch = TrackerBatch(
+            ("Hips", "LeftFoot"),
+            np.array([[0.0, 1.0, 0.0], [0.1, 0.0, 0.2]], dtype=np.float32),
+            np.tile(np.array([0, 0, 0, 1], dtype=np.float32), (2, 1)),
+        )
+        sender.send_batch(batch, {"Hips": 1, "LeftFoot": 3})
+        bundle = OscBundle(sock.recv(65536))
+        assert [m.address for m in bundle] == [
+            "/tracking/trackers/1/position",
+            "/tracking/trackers/1/rotation",
+            "/tracking/trackers/3/position",
+            "/tracking/trackers/3/rotation",
+        ]
+    finally:
+        sender.close()
+        sock.close()
+
+
+def test_full_send_buffer_drops_the_frame_instead_of_blocking():
+    class _FullSocket:
+        def sendto(self, data, address):
+            raise BlockingIOError
+
+        def close(self):
+            pass
+
+    sender = VRChatOscTrackerSender("127.0.0.1", 9)
+    real_sock, sender._sock = sender._sock, _FullSocket()
+    try:
+        sender.send_tracker(1, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0])
+        assert sender.dropped_frames == 1
+    finally:
+        sender._sock = real_sock
+        sender.close()
+
+
+def test_background_sender_delivers_frames_in_order():
+    sock = _receiver()
+    sender = VRChatOscTrackerSender("127.0.0.1", sock.getsockname()[1], background=True)
+    try:
+        for i in range(1, 4):
+            sender.send_tracker(i, [float(i), 0.0, 0.0], [0.0, 0.0, 0.0, 1.0])
+        sender.close()  # 積まれたフレームを送り切ってから受信する
+        received = [
+            [m.address for m in OscBundle(sock.recv(65536))][0] for _ in range(3)
+        ]
+        assert received == [f"/tracking/trackers/{i}/position" for i in range(1, 4)]
+        assert sender.overflowed_frames == 0
+    finally:
+        sender.close()
+        sock.close()
+
+
+def test_send_tracker_accepts_float32_arrays():
+    sock = _receiver()
+    sender = VRChatOscTrackerSender("127.0.0.1", sock.getsockname()[1])
+    try:
+        sender.send_tracker(
+            2,
+            np.array([0.5, 1.5, -0.25], dtype=np.float32),
+            np.array([0, 0, 0, 1], dtype=np.float32),
+        )
+        position, rotation = [m.params for m in OscBundle(sock.recv(65536))]
+        assert position == [0.5, 1.5, -0.25]
+        assert rotation == [0.0, 0.0, 0.0, 1.0]
+    finally:
+        sender.close()
+        sock.close()
+
+
+@pytest.mark.parametrize("tracker_index", [0, NUM_TRACKERS + 1, "1", 1.5])
+def test_out_of_range_tracker_index_raises_value_error(tracker_index):
+    sender = VRChatOscTrackerSender("127.0.0.1", 9)
+    try:
+        with pytest.raises(ValueError, match=re.escape(repr(tracker_index))):
+            sender.send_tracker(tracker_index, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0])
+    finally:
+        sender.close()
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_send_after_close_raises_instead_of_dropping_silently(background):
+    sender = VRChatOscTrackerSender("127.0.0.1", 9, background=background)
+    sender.close()
+    assert sender._queue is None
+    with pytest.raises(RuntimeError):
+        sender.send_tracker(1, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0])
+    sender.close()  # 2 回目は何もしない
@@ -0,0 +1,95 @@
+import numpy as np
+
+from estv.estimators.pose_drawer import (
+    LINE_COLOR,
+    POINT_COLOR,
+    POINT_EDGE_COLOR,
+    POSE_CONNECTIONS,
+    PoseOverlay,
+    draw_pose_landmarks,
+)
+from estv.estimators.pose_estimator import LANDMARK_DTYPE, PoseLandmark
+
+
+def shoulders_only():
+    landmarks = [None] * 33
+    landmarks[11] = PoseLandmark(0.25, 0.5, 0.0, 1.0)
+    landmarks[12] = PoseLandmark(0.75, 0.5, 0.0, 1.0)
+    return landmarks
+
+
+def test_draws_connections_between_visible_landmarks():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    out = draw_pose_landmarks(image, shoulders_only())
+
+    assert tuple(out[50, 100]) == LINE_COLOR
+    assert tuple(out[50, 50]) == POINT_COLOR
+    assert not image.any()
+
+
+def test_skips_missing_and_out_of_range_landmarks():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    landmarks = shoulders_only()[:12]  # 12 番は範囲外
+    out = draw_pose_landmarks(image, landmarks)
+
+    assert not out[50, 100].any()
+    assert tuple(out[50, 50]) == POINT_COLOR
+    assert draw_pose_landmarks(image, []) is image
+
+
+def test_keypoints_near_border_are_clipped():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    out = draw_pose_landmarks(image, [PoseLandmark(0.0, 1.0, 0.0, 1.0)])
+
+    assert tuple(out[99, 0]) == POINT_COLOR
+    assert not out[0, 199].any()
+
+
+def test_in_place_draws_on_given_image():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    out = draw_pose_landmarks(image, shoulders_only(), in_place=True)
+
+    assert out is image
+    assert tuple(image[50, 100]) == LINE_COLOR
+
+
+def test_overlay_matches_direct_drawing():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (100, 200, 3), dtype=np.uint8)
+    landmarks = shoulders_only()
+    overlay = PoseOverlay(landmarks, image.shape)
+
+    expected = draw_pose_landmarks(image, landmarks)
+    out = overlay.apply(image.copy())
+
+    # 線の縁はアルファ合成の丸め分だけずれる
+    assert np.abs(out.astype(int) - expected).max() <= 3
+    assert tuple(out[50, 50]) == POINT_COLOR
+
+
+def test_structured_array_draws_like_list():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    landmarks = shoulders_only()
+    arr = np.array(
+        [lm.as_tuple() if lm is not None else (np.nan,) * 4 for lm in landmarks],
+        dtype=LANDMARK_DTYPE,
+    )
+
+    assert np.array_equal(draw_pose_landmarks(image, arr), draw_pose_landmarks(image, landmarks))
+    assert draw_pose_landmarks(image, arr[:0]) is image
+
+
+def test_keypoints_are_drawn_without_anti_aliasing():
+    image = np.full((100, 200, 3), 128, dtype=np.uint8)
+    out = draw_pose_landmarks(image, [PoseLandmark(0.5, 0.5, 0.0, 1.0)])
+
+    # 外枠・本体・背景の 3 色だけで構成され、縁に中間色が出ない
+    colors = {tuple(c) for c in out.reshape(-1, 3).tolist()}
+    assert colors == {(128, 128, 128), POINT_EDGE_COLOR, POINT_COLOR}
+
+
+def test_pose_connections_are_read_only_int32():
+    assert POSE_CONNECTIONS.dtype == np.int32
+    assert POSE_CONNECTIONS.shape[1] == 2
+    assert POSE_CONNECTIONS.flags.c_contiguous
+    assert not POSE_CONNECTIONS.flags.writeable
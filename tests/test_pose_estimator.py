@@ -0,0 +1,51 @@
+import numpy as np
+
+from estv.estimators.pose_estimator import (
+    LANDMARK_DTYPE,
+    PoseEstimator,
+    PoseEstimatorPool,
+    landmarks_from_array,
+)
+
+
+def test_pool_reuses_released_estimators():
+    pool = PoseEstimatorPool(max_idle=1)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first is not second
+
+    pool.release(first)
+    pool.release(second)  # 保持数を超えた分は解放される
+    assert pool.acquire() is first
+    pool.release(first)
+    pool.close()
+
+
+def test_estimate_reuses_rgb_buffer():
+    estimator = PoseEstimator()
+    frame = np.random.default_rng(0).integers(0, 256, (48, 64, 3), dtype=np.uint8)
+    try:
+        assert estimator.estimate(frame) == []
+        buf = estimator._rgb_buf
+        estimator.estimate(frame)
+        assert estimator._rgb_buf is buf
+        assert np.array_equal(buf, frame[..., ::-1])
+
+        # 非連続な入力でも C 連続のバッファへ変換する
+        estimator.estimate(np.asfortranarray(frame))
+        assert estimator._rgb_buf is buf
+        assert buf.flags.c_contiguous
+        assert np.array_equal(buf, frame[..., ::-1])
+    finally:
+        estimator.close()
+
+
+def test_landmarks_from_array_maps_nan_to_none():
+    arr = np.array(
+        [(0.25, 0.5, -0.1, 0.9), (np.nan, np.nan, np.nan, 0.01)], dtype=LANDMARK_DTYPE
+    )
+    first, missing = landmarks_from_array(arr)
+
+    assert missing is None
+    assert first.as_tuple() == tuple(np.float32(v) for v in (0.25, 0.5, -0.1, 0.9))
+    assert landmarks_from_array(np.empty(0, dtype=LANDMARK_DTYPE)) == []
@@ -0,0 +1,201 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+import threading
+import time
+
+import cv2
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+from estv.devices.stereo_calibrator import (
+    StereoParams,
+    _make_object_points,
+    _to_gray,
+    find_chessboard_corners,
+    find_chessboard_corners_pair,
+    stereo_calibrate,
+    stereo_calibrate_async,
+    stereo_calibrate_from_images_async,
+)
+
+
+BOARD_SIZE = (6, 9)
+SQUARE_SIZE_M = 0.02
+IMAGE_SIZE = (640, 480)
+K = np.array([[500.0, 0.0, 320.0], [0.0, 500.0, 240.0], [0.0, 0.0, 1.0]])
+D = np.zeros((1, 5))
+R = cv2.Rodrigues(np.array([0.0, 0.1, 0.0]))[0]
+T = np.array([-0.1, 0.0, 0.0])
+
+
+def make_views(n=3):
+    objp = _make_object_points(BOARD_SIZE, SQUARE_SIZE_M)
+    pts1, pts2 = [], []
+    for i in range(n):
+        rvec = np.array([0.1 * i, -0.1, 0.05])
+        tvec = np.array([-0.05, -0.08, 0.5 + 0.05 * i])
+        p1, _ = cv2.projectPoints(objp, rvec, tvec, K, D)
+        r2 = R @ cv2.Rodrigues(rvec)[0]
+        t2 = R @ tvec + T
+        p2, _ = cv2.projectPoints(objp, cv2.Rodrigues(r2)[0], t2, K, D)
+        pts1.append(p1.astype(np.float32))
+        pts2.append(p2.astype(np.float32))
+    return pts1, pts2
+
+
+def test_object_points_are_shared_and_read_only():
+    objp = _make_object_points(BOARD_SIZE, SQUARE_SIZE_M)
+    assert objp is _make_object_points(BOARD_SIZE, SQUARE_SIZE_M)
+    assert not objp.flags.writeable
+    assert objp.shape == (54, 3)
+    assert np.allclose(objp[7], [SQUARE_SIZE_M, SQUARE_SIZE_M, 0.0])
+
+
+def test_stereo_calibrate_recovers_extrinsics():
+    pts1, pts2 = make_views()
+    params = stereo_calibrate(
+        pts1, pts2, BOARD_SIZE, SQUARE_SIZE_M, K, D, K, D, IMAGE_SIZE, "a", "b"
+    )
+    assert params.rms < 1e-3
+    assert np.allclose(params.r, R, atol=1e-4)
+    assert np.allclose(params.t, T, atol=1e-4)
+
+
+def test_find_chessboard_corners_accepts_gray_and_bgr():
+    board = np.full((480, 640), 255, dtype=np.uint8)
+    sq = 40
+    for y in range(BOARD_SIZE[1] + 1):
+        for x in range(BOARD_SIZE[0] + 1):
+            if (x + y) % 2 == 0:
+                board[40 + y * sq:40 + (y + 1) * sq, 100 + x * sq:100 + (x + 1) * sq] = 0
+
+    found, corners = find_chessboard_corners(board, BOARD_SIZE)
+    assert found
+    assert corners.shape == (54, 1, 2)
+
+    found_bgr, corners_bgr = find_chessboard_corners(
+        cv2.cvtColor(board, cv2.COLOR_GRAY2BGR), BOARD_SIZE
+    )
+    assert found_bgr
+    assert np.allclose(corners, corners_bgr)
+
+    assert find_chessboard_corners(np.zeros_like(board), BOARD_SIZE) == (False, None)
+
+    (found1, c1), (found2, c2) = find_chessboard_corners_pair(
+        board, np.zeros_like(board), BOARD_SIZE
+    )
+    assert found1 and np.allclose(c1, corners)
+    assert not found2 and c2 is None
+
+
+def test_stereo_params_save_load_roundtrip(tmp_path):
+    pts1, pts2 = make_views()
+    params = stereo_calibrate(
+        pts1, pts2, BOARD_SIZE, SQUARE_SIZE_M, K, D, K, D, IMAGE_SIZE, "cam/1", "cam:2"
+    )
+    path = tmp_path / "stereo.npz"
+    params.save(path)
+
+    loaded = StereoParams.load(path)
+    assert np.allclose(loaded.r, params.r)
+    assert loaded.t.shape == (3,)
+    assert loaded.rms == params.rms
+    assert loaded.board_size == BOARD_SIZE
+    assert loaded.image_size == IMAGE_SIZE
+    assert (loaded.cam1_id, loaded.cam2_id) == ("cam/1", "cam:2")
+
+
+def test_stereo_calibrate_keeps_input_intrinsics():
+    pts1, pts2 = make_views()
+    k1, d1 = K.copy(), D.copy()
+    stereo_calibrate(
+        tuple(pts1), pts2, BOARD_SIZE, SQUARE_SIZE_M, k1, d1, K.copy(), D.copy(),
+        IMAGE_SIZE, "1", "2",
+    )
+    assert np.array_equal(k1, K)
+    assert np.array_equal(d1, D)
+
+
+def _wait_for(app, results, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not results and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_stereo_calibrate_async_delivers_result_on_caller_thread():
+    app = QApplication.instance() or QApplication([])
+    pts1, pts2 = make_views()
+    results = []
+    stereo_calibrate_async(
+        pts1, pts2, BOARD_SIZE, SQUARE_SIZE_M, K, D, K, D, IMAGE_SIZE, "1", "2",
+        on_done=lambda r: results.append((r, threading.current_thread())),
+    )
+    _wait_for(app, results)
+
+    result, thread = results[0]
+    assert isinstance(result, StereoParams)
+    assert np.allclose(result.t, T, atol=1e-3)
+    assert thread is threading.main_thread()
+
+
+def test_stereo_calibrate_async_reports_errors():
+    app = QApplication.instance() or QApplication([])
+    pts1, _ = make_views()
+    results = []
+    stereo_calibrate_async(
+        pts1, pts1[:1], BOARD_SIZE, SQUARE_SIZE_M, K, D, K, D, IMAGE_SIZE, "1", "2",
+        on_done=results.append,
+    )
+    _wait_for(app, results)
+
+    assert isinstance(results[0], AssertionError)
+
+
+def test_gray_buffer_is_reused_per_thread():
+    a = np.full((48, 64, 3), 10, np.uint8)
+    b = np.full((48, 64, 3), 200, np.uint8)
+    gray_a = _to_gray(a)
+    assert int(gray_a[0, 0]) == 10
+    gray_b = _to_gray(b)
+    assert gray_b is gray_a
+    assert int(gray_b[0, 0]) == 200
+    assert _to_gray(np.zeros((32, 32, 3), np.uint8)).shape == (32, 32)
+
+
+def test_rectification_is_computed_lazily_and_persisted(tmp_path):
+    pts1, pts2 = make_views()
+    params = stereo_calibrate(
+        pts1, pts2, BOARD_SIZE, SQUARE_SIZE_M, K, D, K, D, IMAGE_SIZE, "1", "2"
+    )
+    assert params.rectification is None
+
+    path = tmp_path / "stereo.npz"
+    params.save(path)
+    with np.load(path) as data:
+        assert "r1" not in data
+    assert StereoParams.load(path).rectification is None
+
+    expected = cv2.stereoRectify(K, D, K, D, IMAGE_SIZE, params.r, params.t, alpha=0)
+    assert np.allclose(params.p2, expected[3])
+    assert params.r1 is params.rectification[0]
+
+    params.save(path)
+    loaded = StereoParams.load(path)
+    assert loaded.rectification is not None
+    assert np.allclose(loaded.q, expected[4])
+
+
+def test_stereo_calibrate_from_images_async_reports_missing_board():
+    app = QApplication.instance() or QApplication([])
+    blank = np.zeros((IMAGE_SIZE[1], IMAGE_SIZE[0], 3), np.uint8)
+    results = []
+    stereo_calibrate_from_images_async(
+        blank, blank, BOARD_SIZE, SQUARE_SIZE_M, K, D, K, D, "1", "2",
+        on_done=lambda r: results.append((r, threading.current_thread())),
+    )
+    _wait_for(app, results)
+
+    result, thread = results[0]
+    assert isinstance(result, ValueError)
+    assert thread is threading.main_thread()
@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+import pytest
+
+from estv.devices.stereo_calibrator import StereoParams
+from estv.estimators import kernels
+from estv.estimators.triangulation import OpenCVTriangulator
+
+
+K = np.array([[500.0, 0.0, 320.0], [0.0, 500.0, 240.0], [0.0, 0.0, 1.0]])
+D = np.zeros((1, 5))
+R = cv2.Rodrigues(np.array([0.0, 0.2, 0.0]))[0]
+T = np.array([-0.2, 0.0, 0.02])
+
+
+def make_params():
+    return StereoParams(
+        k1=K, d1=D, k2=K, d2=D, r=R, t=T, rms=0.0,
+        board_size=(6, 9), square_size_m=0.02,
+        cam1_id="1", cam2_id="2", image_size=(640, 480),
+    )
+
+
+def project(points):
+    pts1, _ = cv2.projectPoints(points, np.zeros(3), np.zeros(3), K, D)
+    pts2, _ = cv2.projectPoints(points, cv2.Rodrigues(R)[0], T, K, D)
+    return pts1.reshape(-1, 2), pts2.reshape(-1, 2)
+
+
+def test_triangulate_recovers_points_and_chirality():
+    rng = np.random.default_rng(0)
+    points = np.column_stack([rng.uniform(-0.3, 0.3, (20, 2)), rng.uniform(1.0, 3.0, 20)])
+    pts1, pts2 = project(points)
+    tri = OpenCVTriangulator(make_params())
+
+    x, mask = tri.triangulate(pts1, pts2)
+
+    assert np.allclose(x, points, atol=1e-6)
+    assert mask.all()
+    assert tri.reprojection_rmse(x, pts1, pts2) < 1e-6
+
+
+def test_triangulate_flags_points_behind_camera():
+    points = np.array([[0.0, 0.0, 2.0], [0.0, 0.0, -2.0]])
+    pts1, pts2 = project(points)
+    tri = OpenCVTriangulator(make_params())
+
+    _, mask = tri.triangulate(pts1, pts2)
+
+    assert mask.tolist() == [True, False]
+
+
+def test_reprojection_rmse_of_offset_points():
+    points = np.array([[0.0, 0.0, 2.0], [0.1, -0.1, 1.5]])
+    pts1, pts2 = project(points)
+    tri = OpenCVTriangulator(make_params())
+
+    assert np.isclose(tri.reprojection_rmse(points, pts1 + 3.0, pts2 - 3.0), 3.0)
+
+
+def _run_kernel(kernel, xh):
+    x = np.empty((xh.shape[1], 3), dtype=np.float64)
+    mask = np.empty(xh.shape[1], dtype=np.bool_)
+    kernel(xh, R[2], float(T[2]), x, mask)
+    return x, mask
+
+
+def test_loop_kernel_matches_numpy_kernel():
+    rng = np.random.default_rng(1)
+    xh = np.vstack([rng.uniform(-3.0, 3.0, (3, 33)), rng.uniform(0.5, 2.0, (1, 33))])
+    x_loop, mask_loop = _run_kernel(kernels._dehom_and_cheirality_loop, xh)
+    x_np, mask_np = _run_kernel(kernels._dehom_and_cheirality_numpy, xh)
+    assert np.allclose(x_loop, x_np)
+    assert np.array_equal(mask_loop, mask_np)
+    assert mask_np.any() and not mask_np.all()
+
+
+def test_jit_kernel_matches_numpy_kernel():
+    pytest.importorskip("numba")
+    assert kernels.dehom_and_cheirality is not kernels._dehom_and_cheirality_numpy
+    kernels.warm_up()
+    rng = np.random.default_rng(2)
+    xh = np.vstack([rng.uniform(-3.0, 3.0, (3, 33)), rng.uniform(0.5, 2.0, (1, 33))])
+    x_jit, mask_jit = _run_kernel(kernels.dehom_and_cheirality, xh)
+    x_np, mask_np = _run_kernel(kernels._dehom_and_cheirality_numpy, xh)
+    assert np.allclose(x_jit, x_np)
+    assert np.array_equal(mask_jit, mask_np)